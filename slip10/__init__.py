@@ -1,14 +1,55 @@
-import importlib.metadata
+import importlib
 
+from .cache import DerivationCache, ExtendedKeyCache, PersistentDerivationCache
+from .counters import enable_stats, reset_stats, stats
+from .export import encode_extended_keys
+from .index import ReverseIndex
+from .keyring import Keyring
+from .node import SLIP10Node
 from .slip10 import SLIP10, InvalidInputError, PrivateDerivationError
-from .utils import HARDENED_INDEX, SLIP10DerivationError
+from .utils import HARDENED_INDEX, DerivationPath, SLIP10DerivationError
+
+# Attributes imported on first access, since they depend on modules which are
+# slow to import (process pools, package metadata).
+_LAZY_ATTRIBUTES = {
+    "derive_many": ".parallel",
+    "iter_extended_keys": ".ingest",
+    "load_extended_keys": ".ingest",
+}
+
+
+def __getattr__(name):
+    if name == "__version__":
+        from importlib import metadata
+
+        value = metadata.version(__package__ or __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-__version__ = importlib.metadata.version(__package__ or __name__)
 
 __all__ = [
     "SLIP10",
+    "SLIP10Node",
+    "DerivationCache",
+    "ExtendedKeyCache",
+    "PersistentDerivationCache",
     "SLIP10DerivationError",
     "PrivateDerivationError",
     "InvalidInputError",
     "HARDENED_INDEX",
+    "DerivationPath",
+    "ReverseIndex",
+    "Keyring",
+    "derive_many",
+    "encode_extended_keys",
+    "iter_extended_keys",
+    "load_extended_keys",
+    "stats",
+    "reset_stats",
+    "enable_stats",
 ]
@@ -0,0 +1,229 @@
+import asyncio
+import collections
+import functools
+import itertools
+
+from .utils import _get_derivation_path
+
+
+async def _scan_chain(
+    account, chain, is_used, gap_limit, batch_size, semaphore, executor
+):
+    loop = asyncio.get_running_loop()
+
+    def derive_batch(start):
+        return loop.run_in_executor(
+            executor,
+            functools.partial(
+                account.derive_children, [chain], range(start, start + batch_size)
+            ),
+        )
+
+    async def lookup(index, pubkey):
+        async with semaphore:
+            return index, pubkey, await is_used(chain, index, pubkey)
+
+    used = []
+    last_used = -1
+    next_index = 0
+    # The addresses derived but not looked up yet.
+    derived = collections.deque()
+    # Always derive the next batch in the background, while looking up the
+    # current one.
+    next_batch = derive_batch(0)
+    lookups = set()
+    try:
+        while True:
+            # Look up every address up to the gap limit past the last used one.
+            while next_index <= last_used + gap_limit:
+                if not derived:
+                    batch = await next_batch
+                    derived.extend(
+                        (next_index + i, pubkey) for i, (_, pubkey) in enumerate(batch)
+                    )
+                    next_batch = derive_batch(next_index + len(batch))
+                index, pubkey = derived.popleft()
+                lookups.add(asyncio.ensure_future(lookup(index, pubkey)))
+                next_index += 1
+            if not lookups:
+                break
+            done, lookups = await asyncio.wait(
+                lookups, return_when=asyncio.FIRST_COMPLETED
+            )
+            for lookup_task in done:
+                index, pubkey, index_is_used = lookup_task.result()
+                if index_is_used:
+                    used.append((index, pubkey))
+                    last_used = max(last_used, index)
+    finally:
+        next_batch.cancel()
+        for lookup_task in lookups:
+            lookup_task.cancel()
+
+    return sorted(used)
+
+
+async def scan_account(
+    account,
+    is_used,
+    gap_limit=20,
+    chains=(0, 1),
+    batch_size=20,
+    max_in_flight=8,
+    executor=None,
+):
+    """Find the used addresses of an account, a la BIP-0044.
+
+    The addresses of each chain are looked up until `gap_limit` consecutive
+    ones are unused. Addresses are derived ahead by batches in an executor,
+    while the lookups of the previous ones are in flight.
+
+    :param account: The SLIP10 node of the account (e.g. m/84'/0'/0').
+    :param is_used: A coroutine function taking (chain (int), index (int),
+                    pubkey (bytes)) and returning whether this address is used.
+    :param gap_limit: The number of consecutive unused addresses after which
+                      to stop scanning a chain.
+    :param chains: The indexes of the chains to scan, by default the external
+                   (0) and the internal (1) chains.
+    :param batch_size: The number of addresses to derive at once.
+    :param max_in_flight: The maximum number of concurrent lookups, for all
+                          the chains.
+    :param executor: The concurrent.futures.Executor to derive addresses in.
+                     Defaults to the event loop's default (thread pool)
+                     executor.
+    :return: A dict mapping each chain to a sorted list of (index (int),
+             pubkey (bytes)) of the used addresses.
+    """
+    for name, value in (
+        ("gap_limit", gap_limit),
+        ("batch_size", batch_size),
+        ("max_in_flight", max_in_flight),
+    ):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"'{name}' must be a positive integer")
+
+    semaphore = asyncio.Semaphore(max_in_flight)
+    results = await asyncio.gather(
+        *(
+            _scan_chain(
+                account, chain, is_used, gap_limit, batch_size, semaphore, executor
+            )
+            for chain in chains
+        )
+    )
+    return dict(zip(chains, results))
+
+
+class AsyncSLIP10:
+    """Asynchronous counterparts of the SLIP10 derivation methods.
+
+    The derivations are run in an executor, so they don't block the event
+    loop. Concurrent identical requests are coalesced: they all wait for the
+    result of a single derivation.
+    """
+
+    def __init__(self, slip10, executor=None):
+        """
+        :param slip10: The SLIP10 object to derive from.
+        :param executor: The concurrent.futures.Executor to derive in.
+                         Defaults to the event loop's default (thread pool)
+                         executor.
+        """
+        self.slip10 = slip10
+        self.executor = executor
+        # The derivations in progress, by request.
+        self._pending = {}
+
+    async def _run(self, request, function, *args):
+        future = self._pending.get(request)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor, functools.partial(function, *args)
+            )
+            self._pending[request] = future
+
+            def forget(future):
+                if self._pending.get(request) is future:
+                    del self._pending[request]
+
+            future.add_done_callback(forget)
+        # Don't cancel the derivation other callers are waiting for if this
+        # one is cancelled.
+        return await asyncio.shield(future)
+
+    async def _run_path_method(self, name, path):
+        path = _get_derivation_path(path)
+        return await self._run((name, path), getattr(self.slip10, name), path)
+
+    async def get_child_from_path(self, path):
+        """See SLIP10.get_child_from_path()."""
+        return await self._run_path_method("get_child_from_path", path)
+
+    async def get_extended_privkey_from_path(self, path):
+        """See SLIP10.get_extended_privkey_from_path()."""
+        return await self._run_path_method("get_extended_privkey_from_path", path)
+
+    async def get_privkey_from_path(self, path):
+        """See SLIP10.get_privkey_from_path()."""
+        return (await self.get_extended_privkey_from_path(path))[1]
+
+    async def get_extended_pubkey_from_path(self, path):
+        """See SLIP10.get_extended_pubkey_from_path()."""
+        return await self._run_path_method("get_extended_pubkey_from_path", path)
+
+    async def get_pubkey_from_path(self, path):
+        """See SLIP10.get_pubkey_from_path()."""
+        return (await self.get_extended_pubkey_from_path(path))[1]
+
+    async def get_xpriv_from_path(self, path):
+        """See SLIP10.get_xpriv_from_path()."""
+        return await self._run_path_method("get_xpriv_from_path", path)
+
+    async def get_xpub_from_path(self, path):
+        """See SLIP10.get_xpub_from_path()."""
+        return await self._run_path_method("get_xpub_from_path", path)
+
+    async def derive_children(self, parent_path, indices):
+        """See SLIP10.derive_children()."""
+        parent_path = _get_derivation_path(parent_path)
+        indices = tuple(indices)
+        return await self._run(
+            ("derive_children", parent_path, indices),
+            self.slip10.derive_children,
+            parent_path,
+            indices,
+        )
+
+    async def iter_path_template(self, template, batch_size=1024):
+        """See SLIP10.iter_path_template().
+
+        The paths are derived by batches of `batch_size` in the executor,
+        the next batch being derived while the current one is consumed.
+
+        :return: An asynchronous iterator of (path (DerivationPath), pubkey
+                 (bytes), chaincode (bytes)).
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("'batch_size' must be a positive integer")
+        loop = asyncio.get_running_loop()
+        paths = await loop.run_in_executor(
+            self.executor, self.slip10.iter_path_template, template
+        )
+
+        def derive_batch():
+            return loop.run_in_executor(
+                self.executor, list, itertools.islice(paths, batch_size)
+            )
+
+        next_batch = derive_batch()
+        try:
+            while True:
+                batch = await next_batch
+                if not batch:
+                    break
+                next_batch = derive_batch()
+                for path in batch:
+                    yield path
+        finally:
+            next_batch.cancel()
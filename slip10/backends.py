@@ -0,0 +1,255 @@
+"""Elliptic curve arithmetic backends for the Weierstrass curves.
+
+A backend implements the few operations SLIP-0010 derivation needs on
+secp256k1 and secp256r1: multiplication of the generator by a scalar,
+addition of a tweak times the generator to a point, and parsing and
+serialization of public keys. Points are opaque objects only ever handed
+back to the backend that created them.
+
+The fastest available backend is selected automatically for each curve.
+The packages a backend depends on are only imported once it is loaded.
+"""
+
+
+class BackendUnavailable(ImportError):
+    """The backend cannot be used on this system."""
+
+    pass
+
+
+class EcdsaBackend:
+    """Pure Python backend, using the ecdsa package."""
+
+    name = "ecdsa"
+    curve_names = ("secp256k1", "secp256r1")
+
+    def __init__(self, curve_name, window=0, table_path=None):
+        """
+        :param curve_name: Either "secp256k1" or "secp256r1".
+        :param window: The window, in bits, of a table of multiples of the
+                       generator to build on first use (about 150ms and 1.3MB
+                       for 8 bits). Larger windows make multiplications
+                       faster, but the size of the table doubles with each
+                       bit. If 0, the generator is multiplied without a
+                       table, which is best for short-lived processes.
+        :param table_path: The path to a table file, to memory-map instead of
+                           building a table. See slip10.tables.
+        """
+        import ecdsa
+
+        from .tables import GeneratorTable
+
+        self.ecdsa = ecdsa
+        self.curve_name = curve_name
+        self.curve = {"secp256k1": ecdsa.SECP256k1, "secp256r1": ecdsa.NIST256p}[
+            curve_name
+        ]
+        self.window = window
+        self._table = None
+        if table_path is not None:
+            self._table = GeneratorTable.load(table_path, curve_name)
+        elif window != 0:
+            if not isinstance(window, int) or not 1 <= window <= 16:
+                raise ValueError("'window' must be between 0 and 16")
+
+    @property
+    def table(self):
+        """The GeneratorTable, or None if the backend does not use one."""
+        if self._table is None and self.window != 0:
+            from .tables import GeneratorTable
+
+            self._table = GeneratorTable.build(self.curve_name, self.window)
+        return self._table
+
+    def privkey_to_pubkey(self, privkey):
+        """Get the compressed public key of a private key, as bytes."""
+        table = self.table
+        if table is None:
+            sk = self.ecdsa.SigningKey.from_string(privkey, self.curve)
+            return sk.get_verifying_key().to_string("compressed")
+
+        secret = int.from_bytes(privkey, "big")
+        if len(privkey) != 32 or not 0 < secret < self.curve.order:
+            raise self.ecdsa.errors.MalformedPointError("Invalid private key")
+        x, y = table.multiply(secret)
+        return bytes((2 + (y & 1),)) + x.to_bytes(32, "big")
+
+    def pubkey_is_valid(self, pubkey):
+        try:
+            self.ecdsa.VerifyingKey.from_string(pubkey, self.curve)
+            return True
+        except self.ecdsa.errors.MalformedPointError:
+            return False
+
+    def pubkey_to_point(self, pubkey):
+        """Decode a public key to a point."""
+        return self.ecdsa.ellipticcurve.PointJacobi.from_bytes(self.curve.curve, pubkey)
+
+    def point_to_pubkey(self, point):
+        """Encode a point to a compressed public key, as bytes."""
+        # Convert to affine coordinates once, instead of for each coordinate.
+        point.scale()
+        return point.to_bytes("compressed")
+
+    def point_add_tweak(self, point, tweak):
+        """Get point + tweak * G, or None if it is the point at infinity."""
+        table = self.table
+        if table is None:
+            point = point + self.curve.generator * tweak
+        else:
+            multiple = table.multiply(tweak)
+            if multiple is not None:
+                point = point + self.ecdsa.ellipticcurve.PointJacobi(
+                    self.curve.curve, *multiple, 1, self.curve.order
+                )
+        if point == self.ecdsa.ellipticcurve.INFINITY:
+            return None
+        return point
+
+
+class CoincurveBackend:
+    """Backend using libsecp256k1, through the coincurve package."""
+
+    name = "coincurve"
+    curve_names = ("secp256k1",)
+
+    def __init__(self, curve_name):
+        import coincurve
+
+        assert curve_name in self.curve_names
+        self.public_key_class = coincurve.PublicKey
+        self.order = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+    def privkey_to_pubkey(self, privkey):
+        """Get the compressed public key of a private key, as bytes."""
+        return self.public_key_class.from_secret(privkey).format()
+
+    def pubkey_is_valid(self, pubkey):
+        try:
+            self.public_key_class(pubkey)
+            return True
+        except ValueError:
+            return False
+
+    def pubkey_to_point(self, pubkey):
+        """Decode a public key to a point."""
+        return self.public_key_class(pubkey)
+
+    def point_to_pubkey(self, point):
+        """Encode a point to a compressed public key, as bytes."""
+        return point.format()
+
+    def point_add_tweak(self, point, tweak):
+        """Get point + tweak * G, or None if it is the point at infinity."""
+        try:
+            return point.add((tweak % self.order).to_bytes(32, "big"))
+        except ValueError:
+            return None
+
+
+class OpenSSLBackend(EcdsaBackend):
+    """Backend using OpenSSL, through the cryptography package, to compute
+    public keys. Other operations are performed by the ecdsa package.
+    """
+
+    name = "openssl"
+    curve_names = ("secp256k1", "secp256r1")
+
+    def __init__(self, curve_name, window=0, table_path=None):
+        """See EcdsaBackend. The table is only used to tweak points."""
+        from cryptography.exceptions import UnsupportedAlgorithm
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        super().__init__(curve_name, window, table_path)
+        self.ec = ec
+        self.ec_curve = {"secp256k1": ec.SECP256K1, "secp256r1": ec.SECP256R1}[
+            curve_name
+        ]()
+        self.encoding = serialization.Encoding.X962
+        self.format = serialization.PublicFormat.CompressedPoint
+        # The linked OpenSSL may have been built without support for this curve.
+        try:
+            ec.derive_private_key(1, self.ec_curve)
+        except UnsupportedAlgorithm:
+            raise BackendUnavailable(f"OpenSSL does not support {curve_name}")
+
+    def privkey_to_pubkey(self, privkey):
+        """Get the compressed public key of a private key, as bytes."""
+        sk = self.ec.derive_private_key(int.from_bytes(privkey, "big"), self.ec_curve)
+        return sk.public_key().public_bytes(self.encoding, self.format)
+
+
+BACKENDS = {
+    backend_class.name: backend_class
+    for backend_class in (CoincurveBackend, OpenSSLBackend, EcdsaBackend)
+}
+# By order of preference. OpenSSL has no specific implementation of secp256k1
+# and its generic one is slower than the ecdsa package's: it is only used for
+# secp256k1 if selected explicitly.
+PREFERRED_BACKENDS = {
+    "secp256k1": ("coincurve", "ecdsa", "openssl"),
+    "secp256r1": ("openssl", "ecdsa"),
+}
+
+
+def available_backends(curve_name):
+    """Get the names of the backends usable for a curve on this system.
+
+    :param curve_name: Either "secp256k1" or "secp256r1".
+
+    :return: A list of backend names, by order of preference.
+    """
+    names = []
+    for name in PREFERRED_BACKENDS.get(curve_name, ()):
+        try:
+            BACKENDS[name](curve_name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def load_backend(curve_name, name=None, **options):
+    """Instanciate a backend for a curve.
+
+    :param curve_name: Either "secp256k1" or "secp256r1".
+    :param name: The name of the backend to use. If None, the preferred
+                 available backend for this curve is used.
+    :param options: Options of the backend's constructor, e.g. the window
+                    of the "ecdsa" backend. They need a backend name.
+
+    :return: The backend.
+    """
+    if options and name is None:
+        raise ValueError("Backend options need a backend name")
+    for backend_name in PREFERRED_BACKENDS.get(curve_name, ()):
+        if name is None:
+            try:
+                return BACKENDS[backend_name](curve_name)
+            except ImportError:
+                continue
+        elif backend_name == name:
+            return BACKENDS[backend_name](curve_name, **options)
+    raise ValueError(f"No backend {name or 'available'} for curve '{curve_name}'")
+
+
+def set_backend(curve_name, backend=None, **options):
+    """Choose the backend used for a curve.
+
+    :param curve_name: Either "secp256k1" or "secp256r1".
+    :param backend: The name of a backend, a backend instance, or None to
+                    select the preferred available backend.
+    :param options: Options of the backend's constructor, if a name is given.
+                    E.g. `set_backend("secp256k1", "ecdsa", window=8)`.
+    """
+    from .utils import WeierstrassCurve, _get_curve_by_name
+
+    curve = _get_curve_by_name(curve_name)
+    if not isinstance(curve, WeierstrassCurve):
+        raise ValueError(f"Curve '{curve_name}' does not use a backend")
+    if backend is None or isinstance(backend, str):
+        backend = load_backend(curve_name, backend, **options)
+    elif options:
+        raise ValueError("Backend options need a backend name")
+    curve.backend = backend
@@ -0,0 +1,293 @@
+"""Benchmarks of the main operations, on each curve and backend.
+
+Run with `python -m slip10.bench`. Use --json to save the results, and
+--compare to compare them with the results of a previous run.
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from .backends import available_backends, set_backend
+from .slip10 import SLIP10
+from .utils import CURVES, HARDENED_INDEX, WeierstrassCurve, _pubkey_to_fingerprint
+
+# The seed of the master node, always the same so that runs are comparable.
+SEED = hashlib.sha256(b"slip10 benchmark seed").digest()
+PATH = "m/44h/0h/0h/0/0"
+
+
+def _bench_from_seed(curve_name):
+    return lambda: SLIP10.from_seed(SEED, curve_name=curve_name)
+
+
+def _bench_from_xpub(curve_name):
+    if curve_name != "secp256k1":
+        return None
+    xpub = SLIP10.from_seed(SEED).get_xpub_from_path("m/0h")
+    return lambda: SLIP10.from_xpub(xpub)
+
+
+def _bench_from_xpriv(curve_name):
+    if curve_name != "secp256k1":
+        return None
+    xpriv = SLIP10.from_seed(SEED).get_xpriv_from_path("m/0h")
+    return lambda: SLIP10.from_xpriv(xpriv)
+
+
+def _bench_private_hardened(curve_name):
+    slip10 = SLIP10.from_seed(SEED, curve_name=curve_name)
+    return lambda: slip10.get_extended_privkey_from_path([HARDENED_INDEX + 1])
+
+
+def _bench_private_non_hardened(curve_name):
+    slip10 = SLIP10.from_seed(SEED, curve_name=curve_name)
+    if not isinstance(slip10.curve, WeierstrassCurve):
+        return None
+    return lambda: slip10.get_extended_privkey_from_path([1])
+
+
+def _bench_public(curve_name):
+    slip10 = SLIP10.from_seed(SEED, curve_name=curve_name)
+    if not isinstance(slip10.curve, WeierstrassCurve):
+        return None
+    slip10 = SLIP10(slip10.chaincode, pubkey=slip10.pubkey, curve_name=curve_name)
+    return lambda: slip10.get_extended_pubkey_from_path([1])
+
+
+def _bench_get_xpub_from_path(curve_name):
+    if curve_name != "secp256k1":
+        return None
+    slip10 = SLIP10.from_seed(SEED)
+    return lambda: slip10.get_xpub_from_path(PATH)
+
+
+def _bench_fingerprint(curve_name):
+    pubkey = SLIP10.from_seed(SEED, curve_name=curve_name).pubkey
+    return lambda: _pubkey_to_fingerprint(pubkey)
+
+
+# Each function returns the operation to time for a curve, or None if the
+# curve does not support it.
+BENCHMARKS = {
+    "from_seed": _bench_from_seed,
+    "from_xpub": _bench_from_xpub,
+    "from_xpriv": _bench_from_xpriv,
+    "private_hardened": _bench_private_hardened,
+    "private_non_hardened": _bench_private_non_hardened,
+    "public": _bench_public,
+    "get_xpub_from_path": _bench_get_xpub_from_path,
+    "fingerprint": _bench_fingerprint,
+}
+
+
+def _percentile(samples, percent):
+    """Get a percentile of sorted samples, by nearest rank."""
+    rank = max(1, -(-len(samples) * percent // 100))
+    return samples[int(rank) - 1]
+
+
+def measure(operation, samples, warmup):
+    """Time an operation.
+
+    :param operation: The function to time, without argument.
+    :param samples: The number of timed calls.
+    :param warmup: The number of calls before the timed ones.
+    :return: A dict of statistics about the durations of the calls, in
+             microseconds.
+    """
+    for _ in range(warmup):
+        operation()
+    durations = []
+    timer = time.perf_counter
+    for _ in range(samples):
+        start = timer()
+        operation()
+        durations.append((timer() - start) * 1e6)
+    return _statistics(durations)
+
+
+def _statistics(durations):
+    durations = sorted(durations)
+    return {
+        "samples": len(durations),
+        "mean": sum(durations) / len(durations),
+        "min": durations[0],
+        "p50": _percentile(durations, 50),
+        "p90": _percentile(durations, 90),
+        "p99": _percentile(durations, 99),
+        "max": durations[-1],
+    }
+
+
+# Time `import slip10` in a fresh interpreter, excluding the interpreter's own
+# startup.
+IMPORT_CODE = """
+import time
+start = time.perf_counter()
+import slip10
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import(samples):
+    """Time the import of the package, in fresh interpreters.
+
+    :param samples: The number of imports.
+    :return: A dict of statistics about the durations of the imports, in
+             microseconds.
+    """
+    durations = [
+        float(subprocess.check_output([sys.executable, "-c", IMPORT_CODE])) * 1e6
+        for _ in range(samples)
+    ]
+    return _statistics(durations)
+
+
+def run(
+    curves=None,
+    backends=None,
+    operations=None,
+    samples=200,
+    warmup=20,
+    import_samples=20,
+):
+    """Run the benchmarks.
+
+    :param curves: The names of the curves to benchmark. Defaults to all.
+    :param backends: The names of the backends to benchmark. Defaults to all
+                     the available ones.
+    :param operations: The names of the operations to benchmark, in
+                       BENCHMARKS. Defaults to all.
+    :param samples: The number of timed calls of each operation.
+    :param warmup: The number of calls of each operation before the timed
+                   ones.
+    :param import_samples: The number of timed imports of the package, each in
+                           a new process, for the "import" operation.
+    :return: A list of dicts, one per curve, backend and operation.
+    """
+    results = []
+    if operations is None or "import" in operations:
+        result = {"curve": None, "backend": None, "operation": "import"}
+        result.update(measure_import(import_samples))
+        results.append(result)
+    for curve in CURVES:
+        if curves is not None and curve.name not in curves:
+            continue
+        if isinstance(curve, WeierstrassCurve):
+            curve_backends = available_backends(curve.name)
+            if backends is not None:
+                curve_backends = [b for b in curve_backends if b in backends]
+            previous_backend = curve.backend
+        else:
+            # The Edwards curves don't use a backend.
+            curve_backends = [None]
+
+        try:
+            for backend in curve_backends:
+                if backend is not None:
+                    set_backend(curve.name, backend)
+                for name, bench in BENCHMARKS.items():
+                    if operations is not None and name not in operations:
+                        continue
+                    operation = bench(curve.name)
+                    if operation is None:
+                        continue
+                    result = {
+                        "curve": curve.name,
+                        "backend": backend,
+                        "operation": name,
+                    }
+                    result.update(measure(operation, samples, warmup))
+                    results.append(result)
+        finally:
+            if isinstance(curve, WeierstrassCurve):
+                curve.backend = previous_backend
+    return results
+
+
+def _key(result):
+    return result["curve"], result["backend"], result["operation"]
+
+
+def _format(results, baseline=None):
+    baseline = {_key(r): r for r in baseline or ()}
+    lines = [
+        f"{'curve':<11}{'backend':<11}{'operation':<22}"
+        f"{'p50 (us)':>10}{'p90 (us)':>10}{'p99 (us)':>10}"
+        + ("    vs baseline" if baseline else "")
+    ]
+    for result in results:
+        line = (
+            f"{result['curve'] or '-':<11}{result['backend'] or '-':<11}"
+            f"{result['operation']:<22}"
+            f"{result['p50']:>10.1f}{result['p90']:>10.1f}{result['p99']:>10.1f}"
+        )
+        previous = baseline.get(_key(result))
+        if previous is not None:
+            # > 1 when it got slower.
+            line += f"{result['p50'] / previous['p50']:>14.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m slip10.bench",
+        description="Benchmark the main operations, on each curve and backend.",
+    )
+    parser.add_argument("--curve", action="append", help="Only benchmark this curve.")
+    parser.add_argument(
+        "--backend", action="append", help="Only benchmark this backend."
+    )
+    parser.add_argument(
+        "--operation",
+        action="append",
+        choices=["import"] + list(BENCHMARKS),
+        help="Only benchmark this operation.",
+    )
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--import-samples", type=int, default=20)
+    parser.add_argument("--json", help="Save the results to this file.")
+    parser.add_argument(
+        "--compare", help="Compare the median durations with this saved run."
+    )
+    args = parser.parse_args(argv)
+    if args.samples <= 0 or args.import_samples <= 0 or args.warmup < 0:
+        parser.error("--samples must be positive and --warmup not negative")
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    results = run(
+        args.curve,
+        args.backend,
+        args.operation,
+        args.samples,
+        args.warmup,
+        args.import_samples,
+    )
+    print(_format(results, baseline))
+
+    if args.json is not None:
+        report = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "samples": args.samples,
+            "warmup": args.warmup,
+            "unit": "us",
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from . import counters
+from .utils import WeierstrassCurve
+
+# Rough per-node overhead of the trie and LRU bookkeeping, in bytes, on top of
+# the key material itself. Only used to account for the byte budget.
+NODE_OVERHEAD = 200
+# Likewise for an entry of the extended key cache, holding a SLIP10Node.
+ENTRY_OVERHEAD = 400
+
+
+class _TrieNode:
+    __slots__ = ("parent", "index", "children", "value")
+
+    def __init__(self, parent, index):
+        self.parent = parent
+        self.index = index
+        self.children = {}
+        # (chaincode, privkey, pubkey), any of the keys may be None.
+        self.value = None
+
+
+def _node_size(value):
+    return NODE_OVERHEAD + sum(len(v) for v in value if v is not None)
+
+
+class DerivationCache:
+    """A size-bounded cache of intermediate derivation nodes.
+
+    Nodes are stored in a trie keyed by the derivation path, under a root
+    identifying the node the derivation started from. This allows a
+    derivation to start from the deepest cached ancestor of the requested
+    path. The least recently used nodes are evicted once the cache is full.
+
+    A cache can be shared among many SLIP10 instances, and used from many
+    threads.
+    """
+
+    def __init__(self, max_nodes=1024, max_bytes=None):
+        """
+        :param max_nodes: The maximum number of nodes to keep in the cache.
+        :param max_bytes: An optional (approximate) memory budget for the
+                          cached nodes, in bytes.
+        """
+        if not isinstance(max_nodes, int) or max_nodes <= 0:
+            raise ValueError("'max_nodes' must be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError("'max_bytes' must be a positive integer")
+
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._roots = {}
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def clear(self):
+        """Remove all the nodes from the cache."""
+        with self._lock:
+            self._roots.clear()
+            self._lru.clear()
+            self.size = 0
+
+    def lookup(self, root, path, private=False):
+        """Get the deepest cached node along a derivation path.
+
+        :param root: The identifier of the node the path starts from.
+        :param path: The derivation path, as a list of integers.
+        :param private: Whether the node must contain a private key. Otherwise
+                        it must contain a public key.
+
+        :return: (depth, (chaincode, privkey, pubkey)) of the deepest cached
+                 ancestor, or (0, None) if there is none.
+        """
+        with self._lock:
+            return self._lookup(root, path, private)
+
+    def _lookup(self, root, path, private):
+        node = self._roots.get(root)
+        if node is None:
+            counters.count("cache_misses")
+            return 0, None
+
+        found_depth, found = 0, None
+        for depth, index in enumerate(path, 1):
+            node = node.children.get(index)
+            if node is None:
+                break
+            value = node.value
+            if value is not None and value[1 if private else 2] is not None:
+                found_depth, found = depth, node
+
+        if found is None:
+            counters.count("cache_misses")
+            return 0, None
+        counters.count("cache_hits")
+        self._lru.move_to_end(found)
+        return found_depth, found.value
+
+    def insert(self, root, path, chaincode, privkey=None, pubkey=None):
+        """Store a derived node.
+
+        :param root: The identifier of the node the path starts from.
+        :param path: The derivation path, as a list of integers. Must not be
+                     empty.
+        :param chaincode: The chaincode of the node, as bytes.
+        :param privkey: The private key of the node, as bytes, or None.
+        :param pubkey: The public key of the node, as bytes, or None.
+        """
+        assert len(path) > 0
+        with self._lock:
+            self._insert(root, path, chaincode, privkey, pubkey)
+
+    def _insert(self, root, path, chaincode, privkey, pubkey):
+        node = self._roots.get(root)
+        if node is None:
+            node = self._roots[root] = _TrieNode(None, root)
+        for index in path:
+            child = node.children.get(index)
+            if child is None:
+                child = node.children[index] = _TrieNode(node, index)
+            node = child
+
+        if node.value is not None:
+            # Don't forget about a key we already know.
+            _, old_privkey, old_pubkey = node.value
+            privkey = privkey if privkey is not None else old_privkey
+            pubkey = pubkey if pubkey is not None else old_pubkey
+            self.size -= _node_size(node.value)
+        node.value = (chaincode, privkey, pubkey)
+        self.size += _node_size(node.value)
+        self._lru[node] = None
+        self._lru.move_to_end(node)
+
+        while len(self._lru) > self.max_nodes or (
+            self.max_bytes is not None and self.size > self.max_bytes and self._lru
+        ):
+            self._evict()
+
+    def _evict(self):
+        node, _ = self._lru.popitem(last=False)
+        self.size -= _node_size(node.value)
+        node.value = None
+        # Prune the branch that is not leading to any cached node anymore.
+        while node.value is None and not node.children:
+            if node.parent is None:
+                del self._roots[node.index]
+                break
+            del node.parent.children[node.index]
+            node = node.parent
+
+
+class ExtendedKeyCache:
+    """A size-bounded cache of parsed extended keys.
+
+    It maps encoded extended keys to the (immutable, and thus shareable)
+    SLIP10Node they were parsed into, so that parsing the same extended keys
+    over and over only costs a dict lookup. The least recently used entries
+    are evicted once the cache is full.
+
+    Only xpubs are cached, unless xprivs caching is explicitly enabled. A
+    cache can be used from many threads.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, xprivs=False):
+        """
+        :param max_entries: The maximum number of extended keys to keep in
+                            the cache.
+        :param max_bytes: An optional (approximate) memory budget for the
+                          cached entries, in bytes.
+        :param xprivs: Whether to also cache xprivs. This keeps private keys
+                       in memory for as long as they are cached.
+        """
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("'max_entries' must be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError("'max_bytes' must be a positive integer")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.xprivs = xprivs
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # encoded key -> (node, validation level index, private, size)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all the entries from the cache, and reset the stats."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def lookup(self, encoded, strictness, private=False):
+        """Get the node an extended key was parsed into.
+
+        :param encoded: The encoded extended key, as str.
+        :param strictness: The index of the validation level the node must
+                           have been validated with at least, in
+                           VALIDATION_LEVELS.
+        :param private: Whether the extended key must be an xpriv. Otherwise
+                        it must be an xpub.
+
+        :return: The node, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(encoded)
+            # A node validated less thoroughly than required, or of the other
+            # kind, does not count.
+            if entry is None or entry[1] > strictness or entry[2] != private:
+                self.misses += 1
+                counters.count("cache_misses")
+                return None
+            self.hits += 1
+            counters.count("cache_hits")
+            self._entries.move_to_end(encoded)
+            return entry[0]
+
+    def insert(self, encoded, strictness, node):
+        """Store the node an extended key was parsed into.
+
+        :param encoded: The encoded extended key, as str.
+        :param strictness: The index of the validation level the node was
+                           validated with, in VALIDATION_LEVELS.
+        :param node: The SLIP10Node.
+        """
+        keys = (node.chaincode, node.privkey, node.pubkey)
+        size = ENTRY_OVERHEAD + len(encoded) + sum(len(k) for k in keys if k)
+        with self._lock:
+            old = self._entries.pop(encoded, None)
+            if old is not None:
+                self.size -= old[3]
+            private = node.privkey is not None
+            self._entries[encoded] = (node, strictness, private, size)
+            self.size += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self.size > self.max_bytes
+                and self._entries
+            ):
+                _, (_, _, _, size) = self._entries.popitem(last=False)
+                self.size -= size
+
+
+# The header of a persistent cache file: magic, format version, record size,
+# digest of the parent node, capacity (number of slots, a power of 2) and
+# number of used slots. Padded to 64 bytes.
+FILE_MAGIC = b"SLIP10DC"
+FILE_VERSION = 2
+FILE_HEADER_STRUCT = struct.Struct(">8sHH32sQQ")
+FILE_HEADER_SIZE = 64
+# A slot: parent pubkey, index, chaincode, pubkey and checksum. A slot whose
+# pubkey starts with a 0 byte (as the zeroes of a new file) is free. The
+# checksum is the first 4 bytes of the sha256 of the rest of the record: the
+# pages of the map are written back in any order, and a record torn by a crash
+# must not be used.
+FILE_RECORD_STRUCT = struct.Struct(">33sI32s33s4s")
+_PUBKEY_OFFSET = 69
+_CHECKSUM_OFFSET = 102
+# Slots are no longer filled above this ratio, to keep probing short.
+FILE_MAX_LOAD = 0.75
+
+
+def _record_checksum(record):
+    return hashlib.sha256(record[:_CHECKSUM_OFFSET]).digest()[:4]
+
+
+def _parent_digest(curve_name, chaincode, pubkey):
+    return hashlib.sha256(curve_name.encode() + b"\x00" + chaincode + pubkey).digest()
+
+
+class PersistentDerivationCache:
+    """A cache of public derivations from a parent node, stored in a file.
+
+    The file is an open addressing hash table of fixed size records
+    (parent pubkey, index, chaincode, pubkey, checksum), keyed by the full
+    parent pubkey and the index, so that the children of different nodes are
+    never mistaken for one another. A record failing its checksum, e.g. only
+    partly written before a crash, is a miss. It is memory-mapped: opening it is O(1)
+    whatever its size, and it can be mapped read-only by many processes while
+    a single one appends to it. Its header holds a digest of the parent node,
+    so that a file created for another parent is rejected.
+
+    Only public derivations starting from the parent node use the cache. The
+    file never holds private keys.
+    """
+
+    def __init__(self, path, parent, capacity=2**20, readonly=False):
+        """
+        :param path: The path to the file. It is created if it does not exist,
+                     unless `readonly` is set.
+        :param parent: The node the cached derivations start from, as a SLIP10
+                       or SLIP10Node object (e.g. from an account xpub), on a
+                       curve supporting public derivation.
+        :param capacity: The number of records the file can hold, if it is
+                         created. Rounded up to a power of 2. The file is
+                         allocated at once, sparsely if the filesystem allows.
+        :param readonly: Whether to only read from the file, and never write
+                         to it.
+
+        :raise ValueError: If the file is not a cache file, or was created for
+                           another parent node.
+        """
+        if not isinstance(parent.curve, WeierstrassCurve):
+            raise ValueError(f"Curve {parent.curve.name} has no public derivation")
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("'capacity' must be a positive integer")
+
+        self.path = path
+        self.readonly = readonly
+        self._root = (parent.curve.name, parent.chaincode, parent.pubkey)
+        self._lock = threading.Lock()
+        digest = _parent_digest(*self._root)
+
+        fd = os.open(path, os.O_RDONLY if readonly else os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            created = os.fstat(fd).st_size == 0 and not readonly
+            if created:
+                bits = (capacity - 1).bit_length()
+                os.ftruncate(fd, FILE_HEADER_SIZE + (FILE_RECORD_STRUCT.size << bits))
+            file_size = os.fstat(fd).st_size
+            # An empty file can't be mapped.
+            if file_size < FILE_HEADER_SIZE:
+                raise ValueError("Not a derivation cache file")
+            self._map = mmap.mmap(
+                fd,
+                0,
+                access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE,
+            )
+        finally:
+            os.close(fd)
+
+        try:
+            if created:
+                FILE_HEADER_STRUCT.pack_into(
+                    self._map,
+                    0,
+                    FILE_MAGIC,
+                    FILE_VERSION,
+                    FILE_RECORD_STRUCT.size,
+                    digest,
+                    1 << bits,
+                    0,
+                )
+            magic, version, record_size, file_digest, capacity, _ = (
+                FILE_HEADER_STRUCT.unpack_from(self._map)
+            )
+            if (
+                magic != FILE_MAGIC
+                or version != FILE_VERSION
+                or record_size != FILE_RECORD_STRUCT.size
+            ):
+                raise ValueError("Not a derivation cache file")
+            if file_digest != digest:
+                raise ValueError("The cache file was created for another parent node")
+            if file_size != FILE_HEADER_SIZE + record_size * capacity:
+                raise ValueError("The cache file is truncated")
+        except BaseException:
+            self._map.close()
+            raise
+
+        self.capacity = capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._max_records = int(capacity * FILE_MAX_LOAD)
+
+    def __len__(self):
+        return FILE_HEADER_STRUCT.unpack_from(self._map)[5]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def flush(self):
+        """Write the changes to the disk."""
+        if not self.readonly:
+            self._map.flush()
+
+    def close(self):
+        """Flush and unmap the file. The cache can't be used anymore."""
+        self.flush()
+        self._map.close()
+
+    def _find(self, parent_pubkey, index):
+        """Get the offset of the slot of a record, or of the free slot it
+        would be stored in. None if there is neither."""
+        # The x coordinate of the parent is uniformly distributed already.
+        # Fibonacci hashing mixes in the index, and does not depend on the
+        # process' hash seed.
+        key = int.from_bytes(parent_pubkey[1:9], "big") ^ index
+        slot = (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self._shift
+        record_size = FILE_RECORD_STRUCT.size
+        data = self._map
+        for _ in range(self.capacity):
+            offset = FILE_HEADER_SIZE + slot * record_size
+            if data[offset + _PUBKEY_OFFSET] == 0 or (
+                data[offset : offset + 33] == parent_pubkey
+                and int.from_bytes(data[offset + 33 : offset + 37], "big") == index
+            ):
+                return offset
+            slot = (slot + 1) & (self.capacity - 1)
+        return None
+
+    def _get(self, parent_pubkey, index):
+        offset = self._find(parent_pubkey, index)
+        if offset is None or self._map[offset + _PUBKEY_OFFSET] == 0:
+            return None
+        record = self._map[offset : offset + FILE_RECORD_STRUCT.size]
+        if _record_checksum(record) != record[_CHECKSUM_OFFSET:]:
+            return None
+        _, _, chaincode, pubkey, _ = FILE_RECORD_STRUCT.unpack(record)
+        return chaincode, pubkey
+
+    def _walk(self, path):
+        """Get the records along a path, up to the first missing one.
+
+        :return: A list of (chaincode, pubkey).
+        """
+        parent_pubkey = self._root[2]
+        records = []
+        for index in path:
+            record = self._get(parent_pubkey, index)
+            if record is None:
+                break
+            records.append(record)
+            parent_pubkey = record[1]
+        return records
+
+    def lookup(self, root, path, private=False):
+        """Get the deepest cached node along a derivation path.
+
+        See DerivationCache.lookup(). Only public derivations from the parent
+        node are looked up.
+        """
+        if private or root != self._root:
+            counters.count("cache_misses")
+            return 0, None
+        with self._lock:
+            records = self._walk(path)
+        if not records:
+            counters.count("cache_misses")
+            return 0, None
+        counters.count("cache_hits")
+        chaincode, pubkey = records[-1]
+        return len(records), (chaincode, None, pubkey)
+
+    def insert(self, root, path, chaincode, privkey=None, pubkey=None):
+        """Store a derived node, if its parent is stored.
+
+        See DerivationCache.insert(). Only the public part of a node derived
+        from the parent node is stored, and nothing is stored once the file is
+        full or if it is read-only.
+        """
+        assert len(path) > 0
+        if self.readonly or pubkey is None or root != self._root:
+            return
+        with self._lock:
+            records = self._walk(path[:-1])
+            if len(records) < len(path) - 1:
+                return
+            parent_pubkey = records[-1][1] if records else self._root[2]
+            count = len(self)
+            if count >= self._max_records:
+                return
+            offset = self._find(parent_pubkey, path[-1])
+            if offset is None:
+                return
+            used = self._map[offset + _PUBKEY_OFFSET] != 0
+            if used:
+                # Only a record which failed its checksum (e.g. torn by a
+                # crash) is overwritten.
+                stored = self._map[offset : offset + FILE_RECORD_STRUCT.size]
+                if _record_checksum(stored) == stored[_CHECKSUM_OFFSET:]:
+                    return
+            record = FILE_RECORD_STRUCT.pack(
+                parent_pubkey, path[-1], chaincode, pubkey, b""
+            )
+            record = record[:_CHECKSUM_OFFSET] + _record_checksum(record)
+            # Mark a free slot as used last, so that readers never see a
+            # partial record.
+            self._map[offset : offset + _PUBKEY_OFFSET] = record[:_PUBKEY_OFFSET]
+            self._map[
+                offset + _PUBKEY_OFFSET + 1 : offset + FILE_RECORD_STRUCT.size
+            ] = record[_PUBKEY_OFFSET + 1 :]
+            self._map[offset + _PUBKEY_OFFSET] = record[_PUBKEY_OFFSET]
+            if not used:
+                struct.pack_into(
+                    ">Q", self._map, FILE_HEADER_STRUCT.size - 8, count + 1
+                )
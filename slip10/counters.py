@@ -0,0 +1,63 @@
+"""Counters of the costly operations performed by the library.
+
+They tell why a derivation was slow, e.g. whether a cache was hit or how
+many scalar multiplications it took. Counting costs a function call per
+operation, and can be disabled altogether.
+"""
+
+COUNTERS = (
+    # HMAC-SHA512 computations, for master key generation and derivation.
+    "hmac_sha512",
+    # Multiplications of the generator by a scalar, to compute a public key
+    # or to tweak one.
+    "scalar_multiplications",
+    # Decodings of a compressed public key to a point (a modular square root).
+    "point_decompressions",
+    "fingerprints",
+    # Retries of master key generation or of a derivation step, because the
+    # resulting key was invalid. Vanishingly rare.
+    "retries",
+    # Lookups in a DerivationCache, a PersistentDerivationCache or an
+    # ExtendedKeyCache.
+    "cache_hits",
+    "cache_misses",
+)
+
+_counters = dict.fromkeys(COUNTERS, 0)
+_enabled = True
+
+
+def count(name, n=1):
+    """Increment a counter, if counting is enabled."""
+    if _enabled:
+        _counters[name] += n
+
+
+def stats(reset=False):
+    """Get the current value of the counters.
+
+    The counters are shared by all threads, and may miss a few increments
+    when operations are performed concurrently.
+
+    :param reset: Whether to also reset the counters to 0.
+    :return: A dict mapping the name of each counter to its value.
+    """
+    snapshot = dict(_counters)
+    if reset:
+        reset_stats()
+    return snapshot
+
+
+def reset_stats():
+    """Reset all the counters to 0."""
+    for name in COUNTERS:
+        _counters[name] = 0
+
+
+def enable_stats(enabled=True):
+    """Enable or disable counting. It is enabled by default.
+
+    :param enabled: Whether to count operations.
+    """
+    global _enabled
+    _enabled = enabled
@@ -0,0 +1,65 @@
+from .slip10 import PrivateDerivationError, SerializationError
+from .utils import (
+    ENCODING_PREFIX,
+    EXTENDED_KEY_STRUCT,
+    _b58encode_check,
+)
+
+
+def _pack_extended_keys(nodes, private):
+    """Serialize extended keys into a single buffer.
+
+    :param nodes: A list of SLIP10 or SLIP10Node objects.
+    :param private: Whether to serialize the private keys.
+    :return: A bytearray of the concatenated 78 bytes serializations.
+    """
+    size = EXTENDED_KEY_STRUCT.size
+    buffer = bytearray(size * len(nodes))
+    pack_into = EXTENDED_KEY_STRUCT.pack_into
+    kind = "private" if private else "public"
+    name = "xpriv" if private else "xpub"
+    for offset, node in zip(range(0, len(buffer), size), nodes):
+        if node.curve.name != "secp256k1":
+            raise SerializationError(
+                f"{name} serialization is supported only for secp256k1"
+            )
+        if private:
+            if node.privkey is None:
+                raise PrivateDerivationError
+            key = b"\x00" + node.privkey
+        else:
+            key = node.pubkey
+        pack_into(
+            buffer,
+            offset,
+            ENCODING_PREFIX[node.network][kind],
+            node.depth,
+            node.parent_fingerprint,
+            node.index,
+            node.chaincode,
+            key,
+        )
+    return buffer
+
+
+def encode_extended_keys(nodes, private=False):
+    """Get the encoded extended keys of many nodes at once.
+
+    The nodes are serialized into a single preallocated buffer, then each
+    record is base58check encoded by an encoder specialized for short
+    fixed-length data. This is a lot faster than calling get_xpub() (or
+    get_xpriv()) on each node, for large exports.
+
+    :param nodes: An iterable of SLIP10 or SLIP10Node objects, on secp256k1.
+    :param private: Whether to encode the extended private keys (xprivs)
+                    instead of the extended public keys (xpubs).
+    :return: A list of the encoded extended keys (str), in the order of
+             `nodes`.
+    """
+    nodes = list(nodes)
+    size = EXTENDED_KEY_STRUCT.size
+    records = memoryview(_pack_extended_keys(nodes, private))
+    return [
+        _b58encode_check(bytes(records[offset : offset + size]))
+        for offset in range(0, len(records), size)
+    ]
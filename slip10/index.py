@@ -0,0 +1,165 @@
+import array
+import threading
+
+from .slip10 import InvalidInputError
+from .utils import HARDENED_INDEX, DerivationPath, _hash160
+
+# The hash table is grown once it is half full, so that a lookup of a key
+# which is not indexed (the common case when scanning) stays short.
+MAX_LOAD = 0.5
+INITIAL_SLOTS = 1024
+
+
+class ReverseIndex:
+    """An index of the public keys of an account, to find their path.
+
+    The children of each chain of the account (e.g. m/84'/0'/0'/0/i) are
+    indexed by the hash160 of their public key. Entries are stored in flat
+    arrays: the 20 bytes hashes in a bytearray, the paths in arrays of ints,
+    and an open addressing hash table of entry numbers. An entry takes about
+    40 bytes, so that tens of millions of them fit in memory.
+
+    Lookups can be made from many threads, while the index is extended.
+    """
+
+    def __init__(self, account, chains=(0, 1), gap_limit=20):
+        """
+        :param account: The SLIP10 node of the account (e.g. m/84'/0'/0').
+                        An account with only a public key is enough, and
+                        faster to derive from.
+        :param chains: The indexes of the chains to index, by default the
+                       external (0) and the internal (1) chains.
+        :param gap_limit: The number of children of each chain to index after
+                          the last one which was looked up. They are indexed
+                          at once, and the index is extended as keys are
+                          found.
+        """
+        chains = tuple(chains)
+        if not chains or len(chains) > 256:
+            raise ValueError("'chains' must contain between 1 and 256 chains")
+        for chain in chains:
+            if not isinstance(chain, int) or not 0 <= chain < HARDENED_INDEX:
+                raise ValueError("'chains' must contain unhardened indexes")
+        if not isinstance(gap_limit, int) or gap_limit < 0:
+            raise ValueError("'gap_limit' must be a non-negative integer")
+
+        self.account = account
+        self.chains = chains
+        self.gap_limit = gap_limit
+        # The entries, by entry number.
+        self._hashes = bytearray()
+        self._chain_ids = array.array("B")
+        self._indexes = array.array("I")
+        # The hash table, of entry numbers + 1 (0 for a free slot). Its size is
+        # a power of 2.
+        self._slots = array.array("I", bytes(4 * INITIAL_SLOTS))
+        # The number of indexed children of each chain.
+        self._sizes = [0] * len(chains)
+        self._extend_lock = threading.Lock()
+
+        for chain in chains:
+            self.extend(chain, gap_limit)
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __contains__(self, key):
+        return self._find(self._get_hash(key)) is not None
+
+    def size(self, chain):
+        """Get the number of indexed children of a chain.
+
+        :param chain: The index of the chain.
+        :return: The index after the last indexed child.
+        """
+        return self._sizes[self.chains.index(chain)]
+
+    def extend(self, chain, stop):
+        """Index the children of a chain, up to an index.
+
+        :param chain: The index of the chain.
+        :param stop: The index after the last child to index.
+        :return: The number of children which were added to the index.
+        """
+        chain_id = self.chains.index(chain)
+        if not 0 <= stop <= HARDENED_INDEX:
+            raise InvalidInputError("Invalid child index")
+        with self._extend_lock:
+            start = self._sizes[chain_id]
+            if stop <= start:
+                return 0
+            for index, pubkey, _ in self.account.iter_children([chain], start, stop):
+                self._insert(_hash160(pubkey), chain_id, index)
+            self._sizes[chain_id] = stop
+            return stop - start
+
+    def lookup(self, key):
+        """Find the path of a public key.
+
+        If it is found, the chain is extended so that the `gap_limit` children
+        following it are indexed.
+
+        :param key: A compressed public key (33 bytes), or its hash160 (20
+                    bytes).
+        :return: The DerivationPath of the key relative to the account (chain,
+                 index), or None if it is not indexed.
+        """
+        entry = self._find(self._get_hash(key))
+        if entry is None:
+            return None
+        chain, index = self.chains[self._chain_ids[entry]], self._indexes[entry]
+        if index + 1 + self.gap_limit > self._sizes[self._chain_ids[entry]]:
+            self.extend(chain, min(index + 1 + self.gap_limit, HARDENED_INDEX))
+        return DerivationPath((chain, index))
+
+    @staticmethod
+    def _get_hash(key):
+        if len(key) == 33:
+            return _hash160(key)
+        if len(key) == 20:
+            return bytes(key)
+        raise InvalidInputError("A key must be a pubkey (33 bytes) or a hash160")
+
+    def _find(self, key_hash):
+        """Get the entry number of a hash, or None."""
+        # Take the table once: it may be replaced while growing.
+        slots = self._slots
+        mask = len(slots) - 1
+        hashes = self._hashes
+        # The hashes are uniformly distributed already.
+        slot = int.from_bytes(key_hash[:4], "little") & mask
+        while True:
+            entry = slots[slot]
+            if entry == 0:
+                return None
+            offset = (entry - 1) * 20
+            if hashes[offset : offset + 20] == key_hash:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def _insert(self, key_hash, chain_id, index):
+        if self._find(key_hash) is not None:
+            return
+        entry = len(self._indexes)
+        if entry + 1 > len(self._slots) * MAX_LOAD:
+            self._grow()
+        # Append the entry before making it reachable from the table.
+        self._hashes += key_hash
+        self._chain_ids.append(chain_id)
+        self._indexes.append(index)
+        self._place(self._slots, key_hash, entry)
+
+    @staticmethod
+    def _place(slots, key_hash, entry):
+        mask = len(slots) - 1
+        slot = int.from_bytes(key_hash[:4], "little") & mask
+        while slots[slot] != 0:
+            slot = (slot + 1) & mask
+        slots[slot] = entry + 1
+
+    def _grow(self):
+        slots = array.array("I", bytes(8 * len(self._slots)))
+        hashes = self._hashes
+        for entry in range(len(self._indexes)):
+            self._place(slots, hashes[entry * 20 : entry * 20 + 4], entry)
+        self._slots = slots
@@ -0,0 +1,102 @@
+import functools
+import mmap
+import os
+
+from .node import SLIP10Node
+from .parallel import _map_chunks
+from .slip10 import _check_validation, _parse_extended_key
+
+
+def _parse_node(string, validation):
+    """Get a SLIP10Node out of an xpub or an xpriv.
+
+    :raise ValueError: If the extended key is invalid.
+    """
+    fields = _parse_extended_key(string)
+    node = SLIP10Node(*fields, validation=validation)
+    # Don't encode it again if asked for.
+    object.__setattr__(node, "_xpriv" if fields[1] is not None else "_xpub", string)
+    return node
+
+
+def _parse_chunk(chunk, validation):
+    results = []
+    for line_number, line in chunk:
+        if isinstance(line, bytes):
+            # Non-ASCII characters are reported as invalid characters.
+            line = line.decode("ascii", "replace")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            results.append((line_number, _parse_node(line, validation), None))
+        except ValueError as e:
+            results.append((line_number, None, str(e)))
+    return results
+
+
+def _iter_lines(source):
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+
+    with open(source, "rb") as f:
+        # An empty file can't be mapped.
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as lines:
+            yield from iter(lines.readline, b"")
+
+
+def iter_extended_keys(source, validation="full", workers=None, chunksize=1024):
+    """Parse and validate many xpubs and xprivs, using a pool of processes.
+
+    The lines are read lazily and sent to the workers by chunks, so that
+    files of any size can be processed with a bounded amount of memory. An
+    invalid extended key is reported with its line number, and does not stop
+    the parsing of the others.
+
+    :param source: The path to a file, which is memory-mapped, or an iterable
+                   of lines (str or bytes). Each line contains an xpub or an
+                   xpriv, blank lines are skipped.
+    :param validation: Either "full", "structural" or "trusted". See
+                       VALIDATION_LEVELS.
+    :param workers: The number of worker processes. Defaults to the number
+                    of CPUs. If 1, the keys are parsed in this process.
+    :param chunksize: The number of lines to send to a worker at once.
+    :return: An iterator of (line number (int), SLIP10Node or None, error
+             (str) or None), in the order of the lines.
+    """
+    _check_validation(validation)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("'workers' must be a positive integer")
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("'chunksize' must be a positive integer")
+
+    lines = enumerate(_iter_lines(source), 1)
+    parse_chunk = functools.partial(_parse_chunk, validation=validation)
+    if workers == 1:
+        return (result for line in lines for result in parse_chunk([line]))
+    return _map_chunks(parse_chunk, lines, workers, chunksize)
+
+
+def load_extended_keys(source, validation="full", workers=None, chunksize=1024):
+    """Parse and validate many xpubs and xprivs, using a pool of processes.
+
+    See iter_extended_keys() for the parameters.
+
+    :return: (nodes, errors) with nodes a list of (line number (int),
+             SLIP10Node) for the valid extended keys, and errors a list of
+             (line number (int), error (str)) for the invalid ones.
+    """
+    nodes, errors = [], []
+    for line_number, node, error in iter_extended_keys(
+        source, validation, workers, chunksize
+    ):
+        if node is not None:
+            nodes.append((line_number, node))
+        else:
+            errors.append((line_number, error))
+    return nodes, errors
@@ -0,0 +1,155 @@
+import threading
+
+from .cache import DerivationCache
+from .slip10 import SLIP10, InvalidInputError, PrivateDerivationError
+from .utils import _get_derivation_path, _pubkey_to_fingerprint
+
+
+class Keyring:
+    """Many SLIP10 nodes, e.g. one per wallet, indexed by master fingerprint.
+
+    A (master fingerprint, path) pair, as found in a PSBT, is resolved with a
+    dict lookup before the derivation. A node which is not a master (e.g. an
+    account xpub) is indexed by the fingerprint of its master and its path
+    from it, and resolves the paths starting with it.
+
+    Fingerprints are only 4 bytes long, and some collide among tens of
+    thousands of wallets: the expected pubkey then tells which node to derive
+    from. All the nodes share the keyring's DerivationCache.
+
+    A keyring can be used from many threads.
+    """
+
+    def __init__(self, cache=None):
+        """
+        :param cache: The DerivationCache shared by the nodes of the keyring.
+                      Defaults to a new DerivationCache().
+        """
+        self.cache = cache if cache is not None else DerivationCache()
+        # fingerprint -> list of (origin path indexes, SLIP10)
+        self._entries = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+    def add(self, node, origin=None):
+        """Add a node to the keyring.
+
+        :param node: A SLIP10 or SLIP10Node object, e.g. a master node or an
+                     account node parsed from an xpub.
+        :param origin: For a node which is not a master, (master fingerprint
+                       (bytes), path) with path the DerivationPath, list of
+                       integers or string in m/x/x'/x notation of the node
+                       from its master.
+        :return: The master fingerprint the node is indexed by, as bytes.
+        """
+        if origin is None:
+            if node.depth != 0:
+                raise InvalidInputError("The origin of a non-master node is needed")
+            fingerprint, prefix = _pubkey_to_fingerprint(node.pubkey), ()
+        else:
+            fingerprint, prefix = origin
+            prefix = _get_derivation_path(prefix).indexes
+            if not isinstance(fingerprint, bytes) or len(fingerprint) != 4:
+                raise InvalidInputError("'fingerprint' must be 4 bytes")
+            if len(prefix) != node.depth:
+                raise InvalidInputError("The origin path does not match the depth")
+
+        slip10 = SLIP10(
+            node.chaincode,
+            node.privkey,
+            node.pubkey,
+            node.parent_fingerprint,
+            node.depth,
+            node.index,
+            node.network,
+            node.curve.name,
+            cache=self.cache,
+            validation="trusted",
+        )
+        with self._lock:
+            self._entries.setdefault(fingerprint, []).append((prefix, slip10))
+            self._count += 1
+        return fingerprint
+
+    def remove(self, fingerprint):
+        """Remove all the nodes indexed by a master fingerprint.
+
+        Their nodes are left in the cache, until they are evicted.
+
+        :param fingerprint: The master fingerprint, as bytes.
+        :return: The number of nodes which were removed.
+        """
+        with self._lock:
+            entries = self._entries.pop(fingerprint, ())
+            self._count -= len(entries)
+        return len(entries)
+
+    def get_child_from_path(self, fingerprint, path, pubkey=None):
+        """Get a child node from a master fingerprint and a derivation path.
+
+        :param fingerprint: The master fingerprint, as bytes.
+        :param path: The path from the master node, a DerivationPath, a list
+                     of integers (index of each depth) or a string with
+                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param pubkey: The expected pubkey of the child (bytes), if known. It
+                       is checked, and tells which node to derive from if
+                       many match the fingerprint and path.
+        :return: SLIP10 object, with a private key if any of the matching
+                 nodes derives one.
+
+        :raise PrivateDerivationError: If the path is hardened and none of the
+                                       matching nodes has a private key.
+        """
+        path = _get_derivation_path(path)
+        candidates = [
+            (prefix, slip10)
+            for prefix, slip10 in self._entries.get(fingerprint, ())
+            if path.indexes[: len(prefix)] == prefix
+        ]
+        if not candidates:
+            raise InvalidInputError("No key for this fingerprint and path")
+
+        # The children by pubkey: nodes deriving the same key (e.g. a master
+        # xpriv and its account xpub) are not an ambiguity. Keep the one with
+        # a private key.
+        children = {}
+        derived = False
+        for prefix, slip10 in candidates:
+            # An xpub may not derive the path while another node can.
+            try:
+                child = slip10.get_child_from_path(path.indexes[len(prefix) :])
+            except PrivateDerivationError:
+                continue
+            derived = True
+            if pubkey is not None and child.pubkey != pubkey:
+                continue
+            known = children.get(child.pubkey)
+            if known is None or known.privkey is None:
+                children[child.pubkey] = child
+        if len(children) > 1:
+            raise InvalidInputError(
+                "Many keys for this fingerprint and path, the pubkey is needed"
+            )
+        if children:
+            return children.popitem()[1]
+        if not derived:
+            raise PrivateDerivationError
+        raise InvalidInputError("No key for this fingerprint, path and pubkey")
+
+    def get_privkey_from_path(self, fingerprint, path, pubkey=None):
+        """Get a privkey from a master fingerprint and a derivation path.
+
+        See get_child_from_path() for the parameters.
+
+        :return: privkey (bytes)
+        """
+        privkey = self.get_child_from_path(fingerprint, path, pubkey).privkey
+        if privkey is None:
+            raise PrivateDerivationError
+        return privkey
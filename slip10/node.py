@@ -0,0 +1,298 @@
+from .slip10 import (
+    SLIP10,
+    VALIDATION_LEVELS,
+    InvalidInputError,
+    ParsingError,
+    PrivateDerivationError,
+    SerializationError,
+    _check_validation,
+    _parse_extended_key,
+)
+from .tracing import traced
+from .utils import (
+    HARDENED_INDEX,
+    _b58encode_check,
+    _get_curve_by_name,
+    _pubkey_to_fingerprint,
+    _serialize_extended_key,
+)
+
+_FIELDS = (
+    "chaincode",
+    "privkey",
+    "pubkey",
+    "parent_fingerprint",
+    "depth",
+    "index",
+    "network",
+    "curve",
+)
+
+
+class SLIP10Node:
+    """A compact, immutable and hashable extended key.
+
+    Unlike a SLIP10 object it cannot be modified, which allows it to memoize
+    its fingerprint (used by each of its children) and its serializations.
+    """
+
+    __slots__ = _FIELDS + (
+        "_fingerprint",
+        "_xpub_bytes",
+        "_xpub",
+        "_xpriv_bytes",
+        "_xpriv",
+        "_hash",
+    )
+
+    def __init__(
+        self,
+        chaincode,
+        privkey=None,
+        pubkey=None,
+        fingerprint=bytes(4),
+        depth=0,
+        index=0,
+        network="main",
+        curve_name="secp256k1",
+        validation="full",
+    ):
+        """
+        See SLIP10 for the parameters.
+        """
+        try:
+            curve = _get_curve_by_name(curve_name)
+        except ValueError as e:
+            raise InvalidInputError(e) from None
+
+        _check_validation(validation)
+        if validation != "trusted":
+            SLIP10._validate(
+                curve,
+                chaincode,
+                privkey,
+                pubkey,
+                fingerprint,
+                depth,
+                index,
+                network,
+                validation == "full",
+            )
+        if pubkey is None:
+            pubkey = curve.privkey_to_pubkey(privkey)
+
+        values = (chaincode, privkey, pubkey, fingerprint, depth, index, network, curve)
+        for name, value in zip(_FIELDS, values):
+            object.__setattr__(self, name, value)
+        for name in SLIP10Node.__slots__[len(_FIELDS) :]:
+            object.__setattr__(self, name, None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def _key(self):
+        return (
+            self.chaincode,
+            self.privkey,
+            self.pubkey,
+            self.parent_fingerprint,
+            self.depth,
+            self.index,
+            self.network,
+            self.curve.name,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, SLIP10Node):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self._key()))
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), self._key() + ("trusted",))
+
+    @property
+    def fingerprint(self):
+        """The fingerprint of this node's pubkey, as bytes."""
+        if self._fingerprint is None:
+            object.__setattr__(
+                self, "_fingerprint", _pubkey_to_fingerprint(self.pubkey)
+            )
+        return self._fingerprint
+
+    @traced
+    def get_child(self, index):
+        """Get a child node of this node.
+
+        :param index: The index of the child, as int.
+        :return: SLIP10Node object
+        """
+        if self.privkey is not None:
+            privkey, chaincode = self.curve.derive_private_child(
+                self.privkey, self.chaincode, index, self.pubkey
+            )
+            pubkey = None
+        elif index & HARDENED_INDEX:
+            raise PrivateDerivationError
+        else:
+            pubkey, chaincode = self.curve.derive_public_child(
+                self.pubkey, self.chaincode, index
+            )
+            privkey = None
+
+        return SLIP10Node(
+            chaincode,
+            privkey,
+            pubkey,
+            self.fingerprint,
+            self.depth + 1,
+            index,
+            self.network,
+            self.curve.name,
+            validation="trusted",
+        )
+
+    def get_xpriv(self):
+        """Get the base58 encoded extended private key."""
+        if self._xpriv is None:
+            xpriv = _b58encode_check(self.get_xpriv_bytes())
+            object.__setattr__(self, "_xpriv", xpriv)
+        return self._xpriv
+
+    def get_xpriv_bytes(self):
+        """Get the encoded extended private key."""
+        if self._xpriv_bytes is None:
+            if self.curve.name != "secp256k1":
+                raise SerializationError(
+                    "xpriv serialization is supported only for secp256k1"
+                )
+            if self.privkey is None:
+                raise PrivateDerivationError
+            xpriv_bytes = _serialize_extended_key(
+                self.privkey,
+                self.depth,
+                self.parent_fingerprint,
+                self.index,
+                self.chaincode,
+                self.network,
+            )
+            object.__setattr__(self, "_xpriv_bytes", xpriv_bytes)
+        return self._xpriv_bytes
+
+    def get_xpub(self):
+        """Get the base58 encoded extended public key."""
+        if self._xpub is None:
+            xpub = _b58encode_check(self.get_xpub_bytes())
+            object.__setattr__(self, "_xpub", xpub)
+        return self._xpub
+
+    def get_xpub_bytes(self):
+        """Get the encoded extended public key."""
+        if self._xpub_bytes is None:
+            if self.curve.name != "secp256k1":
+                raise SerializationError(
+                    "xpub serialization is supported only for secp256k1"
+                )
+            xpub_bytes = _serialize_extended_key(
+                self.pubkey,
+                self.depth,
+                self.parent_fingerprint,
+                self.index,
+                self.chaincode,
+                self.network,
+            )
+            object.__setattr__(self, "_xpub_bytes", xpub_bytes)
+        return self._xpub_bytes
+
+    def to_slip10(self, cache=None):
+        """Get a SLIP10 object for this node, to derive from a path.
+
+        :param cache: An optional DerivationCache to store intermediate nodes in.
+        :return: SLIP10 object
+        """
+        return SLIP10(
+            self.chaincode,
+            self.privkey,
+            self.pubkey,
+            self.parent_fingerprint,
+            self.depth,
+            self.index,
+            self.network,
+            self.curve.name,
+            cache=cache,
+            validation="trusted",
+        )
+
+    @classmethod
+    def from_slip10(cls, slip10):
+        """Get a SLIP10Node out of a SLIP10 object."""
+        return cls(
+            slip10.chaincode,
+            slip10.privkey,
+            slip10.pubkey,
+            slip10.parent_fingerprint,
+            slip10.depth,
+            slip10.index,
+            slip10.network,
+            slip10.curve.name,
+            validation="trusted",
+        )
+
+    @classmethod
+    def from_xpub(cls, xpub, validation="full", cache=None):
+        """Get a SLIP10Node out of this xpub
+
+        :param xpub: (str) The encoded serialized extended public key.
+        :param validation: Either "full", "structural" or "trusted". See
+                           VALIDATION_LEVELS.
+        :param cache: An optional ExtendedKeyCache, to get the node from if
+                      this xpub was already parsed.
+        """
+        return cls._from_extended_key(xpub, validation, cache, False)
+
+    @classmethod
+    def from_xpriv(cls, xpriv, validation="full", cache=None):
+        """Get a SLIP10Node out of this xpriv
+
+        :param xpriv: (str) The encoded serialized extended private key.
+        :param validation: Either "full", "structural" or "trusted". See
+                           VALIDATION_LEVELS.
+        :param cache: An optional ExtendedKeyCache, to get the node from if
+                      this xpriv was already parsed. It is only used if it
+                      caches xprivs.
+        """
+        return cls._from_extended_key(xpriv, validation, cache, True)
+
+    @classmethod
+    def _from_extended_key(cls, encoded, validation, cache, private):
+        _check_validation(validation)
+        if isinstance(encoded, str):
+            # The decoder ignores trailing whitespace. Once stripped, the
+            # string is the canonical encoding of the extended key: memoize
+            # it and use it as the cache key.
+            encoded = encoded.rstrip()
+        if private and cache is not None and not cache.xprivs:
+            cache = None
+        if cache is not None:
+            strictness = VALIDATION_LEVELS.index(validation)
+            node = cache.lookup(encoded, strictness, private)
+            if node is not None:
+                return node
+
+        fields = _parse_extended_key(encoded, private)
+        try:
+            node = cls(*fields, validation=validation)
+        except InvalidInputError as e:
+            kind = "xpriv" if private else "xpub"
+            raise ParsingError(f"Invalid {kind}: '{e}'")
+        object.__setattr__(node, "_xpriv" if private else "_xpub", encoded)
+        if cache is not None:
+            cache.insert(encoded, strictness, node)
+        return node
@@ -0,0 +1,100 @@
+import collections
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .slip10 import SLIP10
+
+# The node to derive from, in a worker process.
+_worker_node = None
+
+
+def _init_worker(state):
+    global _worker_node
+    chaincode, privkey, pubkey, fingerprint, depth, index, network, curve_name = state
+    _worker_node = SLIP10(
+        chaincode,
+        privkey,
+        pubkey,
+        fingerprint,
+        depth,
+        index,
+        network,
+        curve_name,
+        validation="trusted",
+    )
+
+
+def _derive_chunk(chunk):
+    if all(isinstance(item, int) for item in chunk):
+        # Only decode the node's pubkey once for all its children.
+        return _worker_node.derive_children([], chunk)
+    return [
+        (
+            _worker_node.derive_children([], [item])[0]
+            if isinstance(item, int)
+            else _worker_node.get_extended_pubkey_from_path(item)
+        )
+        for item in chunk
+    ]
+
+
+def _map_chunks(function, items, workers, chunksize, initializer=None, initargs=()):
+    """Apply a function to chunks of items in a pool of processes.
+
+    :param function: A picklable function taking a list of items and
+                     returning a list of results.
+    :param items: An iterable of items, consumed lazily.
+    :return: An iterator of the results, in the order of `items`.
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+    with ProcessPoolExecutor(
+        workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        # Bound the number of chunks in flight, to not hold all the results
+        # in memory at once when the consumer is slower than the workers.
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def derive_many(slip10, paths, workers=None, chunksize=1024):
+    """Derive many extended pubkeys from a node, using a pool of processes.
+
+    The node is sent to each worker process once, then the paths are sent to
+    the workers by chunks.
+
+    :param slip10: The SLIP10 node to derive from.
+    :param paths: An iterable of derivation paths (a list of integers or a
+                  string with m/x/x'/x notation), or of integers for the
+                  children of the node (e.g. range(1000000)). Both can be
+                  mixed.
+    :param workers: The number of worker processes. Defaults to the number
+                    of CPUs.
+    :param chunksize: The number of paths to send to a worker at once.
+    :return: An iterator of (chaincode (bytes), pubkey (bytes)), in the
+             order of `paths`.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("'workers' must be a positive integer")
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("'chunksize' must be a positive integer")
+
+    state = (
+        slip10.chaincode,
+        slip10.privkey,
+        slip10.pubkey,
+        slip10.parent_fingerprint,
+        slip10.depth,
+        slip10.index,
+        slip10.network,
+        slip10.curve.name,
+    )
+    return _map_chunks(_derive_chunk, paths, workers, chunksize, _init_worker, (state,))
@@ -1,12 +1,19 @@
 import hashlib
 import hmac
+import itertools
+import time
 
-import base58
-
+from . import tracing
+from .tracing import traced
 from .utils import (
+    ENCODING_PREFIX,
     HARDENED_INDEX,
-    _deriv_path_str_to_list,
+    DerivationPath,
+    _b58decode_check,
+    _b58encode_check,
     _get_curve_by_name,
+    _get_derivation_path,
+    _get_path_template,
     _hardened_index_in_path,
     _pubkey_to_fingerprint,
     _serialize_extended_key,
@@ -37,6 +44,66 @@ class SerializationError(ValueError):
         self.message = message
 
 
+# How much to check the keys given to instanciate a SLIP10 object:
+# - "full" checks everything, including that the public key is on the curve
+#   and that it matches the private key.
+# - "structural" checks types, lengths and ranges, but performs no elliptic
+#   curve operation.
+# - "trusted" checks nothing, for keys which were already validated.
+VALIDATION_LEVELS = ("full", "structural", "trusted")
+
+_PRIVATE_PREFIXES = {
+    prefixes["private"].to_bytes(4, "big") for prefixes in ENCODING_PREFIX.values()
+}
+
+
+def _check_validation(validation):
+    """
+    :raise InvalidInputError: If validation is not one of VALIDATION_LEVELS.
+    """
+    if validation not in VALIDATION_LEVELS:
+        raise InvalidInputError(
+            "'validation' must be one of 'full', 'structural' or 'trusted'"
+        )
+
+
+def _parse_extended_key(encoded, private=None):
+    """Decode an xpub or an xpriv, without validating the key it contains.
+
+    :param encoded: (str) The encoded serialized extended key.
+    :param private: True for an xpriv, False for an xpub, or None to tell
+                    them apart by their version prefix.
+    :return: chaincode (bytes), privkey (bytes or None), pubkey (bytes or
+             None), fingerprint (bytes), depth (int), index (int), network
+             (str)
+    :raise ParsingError: If the extended key can't be decoded.
+    """
+    if not isinstance(encoded, str):
+        name = {True: "xpriv", False: "xpub", None: "extended key"}[private]
+        raise InvalidInputError(f"'{name}' must be a string")
+
+    try:
+        extended_key = _b58decode_check(encoded)
+    except ValueError as e:
+        raise ParsingError(str(e)) from None
+    if len(extended_key) != 78:
+        raise ParsingError("Invalid length")
+    network, depth, fingerprint, index, chaincode, key = _unserialize_extended_key(
+        extended_key
+    )
+    if network is None:
+        raise ParsingError("Unknown version prefix")
+
+    if private is None:
+        private = extended_key[:4] in _PRIVATE_PREFIXES
+    if private:
+        if key[0] != 0:
+            raise ParsingError("Invalid xpriv: private key prefix must be 0")
+        # We need to remove the trailing `0` before the actual private key !!
+        return chaincode, key[1:], None, fingerprint, depth, index, network
+    return chaincode, None, key, fingerprint, depth, index, network
+
+
 class SLIP10:
     def __init__(
         self,
@@ -48,6 +115,8 @@ class SLIP10:
         index=0,
         network="main",
         curve_name="secp256k1",
+        cache=None,
+        validation="full",
     ):
         """
         :param chaincode: The master chaincode, used to derive keys. As bytes.
@@ -66,12 +135,45 @@ class SLIP10:
                       need this for serialization.
         :param network: Either "main" or "test".
         :param curve_name: Either "secp256k1", "secp256r1", "ed25519" or "curve25519".
+        :param cache: An optional DerivationCache to store intermediate nodes in.
+        :param validation: Either "full", "structural" or "trusted". See
+                           VALIDATION_LEVELS.
         """
         try:
             curve = _get_curve_by_name(curve_name)
         except ValueError as e:
             raise InvalidInputError(e) from None
 
+        _check_validation(validation)
+        if validation != "trusted":
+            self._validate(
+                curve,
+                chaincode,
+                privkey,
+                pubkey,
+                fingerprint,
+                depth,
+                index,
+                network,
+                validation == "full",
+            )
+        if pubkey is None:
+            pubkey = curve.privkey_to_pubkey(privkey)
+
+        self.chaincode = chaincode
+        self.privkey = privkey
+        self.pubkey = pubkey
+        self.parent_fingerprint = fingerprint
+        self.depth = depth
+        self.index = index
+        self.network = network
+        self.curve = curve
+        self.cache = cache
+
+    @staticmethod
+    def _validate(
+        curve, chaincode, privkey, pubkey, fingerprint, depth, index, network, full
+    ):
         if network not in ["main", "test"]:
             raise InvalidInputError("'network' must be one of 'main' or 'test'")
         if not isinstance(chaincode, bytes):
@@ -86,12 +188,13 @@ class SLIP10:
         if pubkey is not None:
             if not isinstance(pubkey, bytes):
                 raise InvalidInputError("'pubkey' must be bytes")
-            if not curve.pubkey_is_valid(pubkey):
+            if full:
+                if not curve.pubkey_is_valid(pubkey):
+                    raise InvalidInputError("Invalid public key")
+                if privkey is not None and pubkey != curve.privkey_to_pubkey(privkey):
+                    raise InvalidInputError("Public key does not match private key")
+            elif not curve.pubkey_is_well_formed(pubkey):
                 raise InvalidInputError("Invalid public key")
-            if privkey is not None and pubkey != curve.privkey_to_pubkey(privkey):
-                raise InvalidInputError("Public key does not match private key")
-        else:
-            pubkey = curve.privkey_to_pubkey(privkey)
         if depth == 0:
             if fingerprint != bytes(4):
                 raise InvalidInputError(
@@ -99,51 +202,108 @@ class SLIP10:
                 )
             if index != 0:
                 raise InvalidInputError("Index must be 0 if depth is 0 (master xpub)")
-        if network not in ["main", "test"]:
-            raise InvalidInputError("Unknown network")
 
-        self.chaincode = chaincode
-        self.privkey = privkey
-        self.pubkey = pubkey
-        self.parent_fingerprint = fingerprint
-        self.depth = depth
-        self.index = index
-        self.network = network
-        self.curve = curve
+    def _derive_path(self, path, private, with_parent=False):
+        """Derive the node at the end of a derivation path, starting from the
+        deepest ancestor in the cache if any.
+
+        :param path: A sequence of integers (index of each depth).
+        :param private: Whether to use private derivation. Otherwise public
+                        derivation is used, and the path must not contain any
+                        hardened index.
+        :param with_parent: Whether to also get the pubkey of the node's
+                            parent (for its fingerprint), from the same walk.
+        :return: parent_pubkey (bytes or None), chaincode (bytes),
+                 privkey (bytes or None), pubkey (bytes or None)
+                 The parent_pubkey is only set if `with_parent` is, and the
+                 path is not empty. The pubkey may be None for a private
+                 derivation, and the privkey is None for a public derivation.
+        """
+        chaincode, privkey, pubkey = self.chaincode, self.privkey, self.pubkey
+        if not private:
+            privkey = None
+        parent_pubkey = None
+        if len(path) == 0:
+            return parent_pubkey, chaincode, privkey, pubkey
+
+        cache = self.cache
+        start = 0
+        if cache is not None:
+            # The private key follows from the public key: the xpub and the
+            # xpriv of a node share their cached derivations.
+            root = (self.curve.name, chaincode, self.pubkey)
+            # The last step must be walked to get the parent's pubkey.
+            start, node = cache.lookup(
+                root, path[:-1] if with_parent else path, private
+            )
+            if node is not None:
+                chaincode, privkey, pubkey = node
+                if not private:
+                    privkey = None
+
+        # Keep the decoded pubkey along the way for public derivation.
+        point = None
+        last_depth = len(path) - 1
+        hooks = tracing._hooks
+        for depth in range(start, len(path)):
+            index = path[depth]
+            if hooks:
+                step_start = time.perf_counter()
+            if private:
+                if pubkey is None and (
+                    index & HARDENED_INDEX == 0 or (with_parent and depth == last_depth)
+                ):
+                    pubkey = self.curve.privkey_to_pubkey(privkey)
+                    if cache is not None and depth > 0:
+                        cache.insert(root, path[:depth], chaincode, privkey, pubkey)
+                parent_pubkey = pubkey
+                privkey, chaincode = self.curve.derive_private_child(
+                    privkey, chaincode, index, pubkey
+                )
+                pubkey = None
+            else:
+                if point is None:
+                    point = self.curve.pubkey_to_point(pubkey)
+                parent_pubkey = pubkey
+                point, pubkey, chaincode = self.curve.derive_public_child_from_point(
+                    point, pubkey, chaincode, index
+                )
+            if hooks:
+                tracing._step(
+                    hooks,
+                    step_start,
+                    "private" if private else "public",
+                    self.curve,
+                    self.depth + depth + 1,
+                    index & HARDENED_INDEX != 0,
+                )
+            if cache is not None:
+                cache.insert(root, path[: depth + 1], chaincode, privkey, pubkey)
+
+        if not with_parent:
+            parent_pubkey = None
+        return parent_pubkey, chaincode, privkey, pubkey
 
+    @traced
     def get_child_from_path(self, path):
         """Get an child node from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: SLIP10 object
         """
-        if isinstance(path, str):
-            path = _deriv_path_str_to_list(path)
+        path = _get_derivation_path(path)
 
         if len(path) == 0:
             return self
 
-        if _hardened_index_in_path(path) and self.privkey is None:
+        if path.has_hardened and self.privkey is None:
             raise PrivateDerivationError
 
-        chaincode = self.chaincode
-        privkey = self.privkey
-        if privkey is not None:
-            pubkey = None
-            for index in path:
-                parent_privkey = privkey
-                privkey, chaincode = self.curve.derive_private_child(
-                    privkey, chaincode, index
-                )
-            parent_pubkey = self.curve.privkey_to_pubkey(parent_privkey)
-        else:
-            pubkey = self.pubkey
-            for index in path:
-                parent_pubkey = pubkey
-                pubkey, chaincode = self.curve.derive_public_child(
-                    pubkey, chaincode, index
-                )
+        parent_pubkey, chaincode, privkey, pubkey = self._derive_path(
+            path.indexes, self.privkey is not None, with_parent=True
+        )
 
         return SLIP10(
             chaincode,
@@ -154,34 +314,35 @@ class SLIP10:
             index=path[-1],
             network=self.network,
             curve_name=self.curve.name,
+            cache=self.cache,
+            validation="trusted",
         )
 
+    @traced
     def get_extended_privkey_from_path(self, path):
         """Get an extended privkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: chaincode (bytes), privkey (bytes)
         """
         if self.privkey is None:
             raise PrivateDerivationError
 
-        if isinstance(path, str):
-            path = _deriv_path_str_to_list(path)
+        path = _get_derivation_path(path)
 
-        chaincode, privkey = self.chaincode, self.privkey
-        for index in path:
-            privkey, chaincode = self.curve.derive_private_child(
-                privkey, chaincode, index
-            )
+        _, chaincode, privkey, _ = self._derive_path(path.indexes, True)
 
         return chaincode, privkey
 
+    @traced
     def get_privkey_from_path(self, path):
         """Get a privkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: privkey (bytes)
         """
         if self.privkey is None:
@@ -189,51 +350,320 @@ class SLIP10:
 
         return self.get_extended_privkey_from_path(path)[1]
 
+    @traced
     def get_extended_pubkey_from_path(self, path):
         """Get an extended pubkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: chaincode (bytes), pubkey (bytes)
         """
-        if isinstance(path, str):
-            path = _deriv_path_str_to_list(path)
+        path = _get_derivation_path(path)
 
-        if _hardened_index_in_path(path) and self.privkey is None:
+        if path.has_hardened and self.privkey is None:
             raise PrivateDerivationError
 
-        chaincode, key = self.chaincode, self.privkey
-        pubkey = self.pubkey
         # We'll need the private key at some point anyway, so let's derive
         # everything from private keys.
-        if _hardened_index_in_path(path):
-            for index in path:
-                key, chaincode = self.curve.derive_private_child(key, chaincode, index)
-                pubkey = self.curve.privkey_to_pubkey(key)
+        if path.has_hardened:
+            _, chaincode, privkey, pubkey = self._derive_path(path.indexes, True)
+            if pubkey is None:
+                pubkey = self.curve.privkey_to_pubkey(privkey)
         # We won't need private keys for the whole path, so let's only use
         # public key derivation.
         else:
-            for index in path:
-                pubkey, chaincode = self.curve.derive_public_child(
-                    pubkey, chaincode, index
-                )
+            _, chaincode, _, pubkey = self._derive_path(path.indexes, False)
 
         return chaincode, pubkey
 
+    @traced
     def get_pubkey_from_path(self, path):
         """Get a pubkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: privkey (bytes)
         """
         return self.get_extended_pubkey_from_path(path)[1]
 
+    @traced
+    def derive_children(self, parent_path, indices):
+        """Get the extended pubkeys of many children of the same parent node.
+
+        The parent node is derived only once, so that deriving a range of
+        siblings (e.g. the receive addresses m/84'/0'/0'/0/i) costs a single
+        derivation step per child. The children found in the cache are not
+        derived again.
+
+        :param parent_path: A DerivationPath, a list of integers (index of each
+                            depth) or a string with m/x/x'/x notation. (e.g.
+                            m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param indices: An iterable of integers, the indexes of the children
+                        to derive under the parent node.
+        :return: A list of (chaincode (bytes), pubkey (bytes)), in the order
+                 of `indices`.
+        """
+        parent_path = _get_derivation_path(parent_path)
+        indices = list(indices)
+
+        children = self._iter_children(
+            parent_path, indices, _hardened_index_in_path(indices)
+        )
+        return [(chaincode, pubkey) for _, chaincode, pubkey in children]
+
+    @traced
+    def iter_children(self, path_prefix, start=0, stop=None):
+        """Lazily iterate over the extended pubkeys of the children of a node.
+
+        The parent node is derived only once, and the children are derived one
+        at a time as they are consumed.
+
+        :param path_prefix: The path to the parent node, a DerivationPath, a
+                            list of integers (index of each depth) or a string
+                            with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                            m/0H/1/2H/2).
+        :param start: The index of the first child.
+        :param stop: The index after the last child. Defaults to the end of
+                     the unhardened (or hardened, if `start` is hardened)
+                     indexes.
+        :return: An iterator of (index (int), pubkey (bytes), chaincode (bytes))
+        """
+        path_prefix = _get_derivation_path(path_prefix)
+        if stop is None:
+            stop = HARDENED_INDEX if start < HARDENED_INDEX else 2 * HARDENED_INDEX
+        if not 0 <= start <= stop <= 2 * HARDENED_INDEX:
+            raise InvalidInputError("Invalid range of child indexes")
+
+        children = self._iter_children(
+            path_prefix, range(start, stop), start < stop and stop > HARDENED_INDEX
+        )
+        return ((index, pubkey, chaincode) for index, chaincode, pubkey in children)
+
+    def _iter_children(self, parent_path, indices, hardened):
+        """Derive the parent node, and get an iterator deriving its children.
+
+        :param parent_path: A list of integers (index of each depth).
+        :param indices: An iterable of integers, the indexes of the children.
+        :param hardened: Whether `indices` contains a hardened index.
+        :return: An iterator of (index (int), chaincode (bytes), pubkey (bytes))
+        """
+        if self.privkey is None:
+            if hardened or parent_path.has_hardened:
+                raise PrivateDerivationError
+            chaincode, pubkey = self.get_extended_pubkey_from_path(parent_path)
+            return self._generate_public_children(
+                chaincode, pubkey, parent_path.indexes, indices
+            )
+
+        chaincode, privkey = self.get_extended_privkey_from_path(parent_path)
+        return self._generate_private_children(
+            chaincode, privkey, parent_path.indexes, indices
+        )
+
+    def _lookup_child(self, path):
+        """Get the chaincode and pubkey of a node from the cache, or None."""
+        if self.cache is None:
+            return None
+        root = (self.curve.name, self.chaincode, self.pubkey)
+        depth, node = self.cache.lookup(root, path)
+        if depth < len(path):
+            return None
+        return node[0], node[2]
+
+    def _insert_child(self, path, chaincode, privkey, pubkey):
+        if self.cache is not None:
+            root = (self.curve.name, self.chaincode, self.pubkey)
+            self.cache.insert(root, path, chaincode, privkey, pubkey)
+
+    def _generate_public_children(self, chaincode, pubkey, parent_path, indices):
+        depth = self.depth + len(parent_path) + 1
+        # Only decode the parent's pubkey once for all its children, and not
+        # at all if they are all cached.
+        point = None
+        for index in indices:
+            path = parent_path + (index,)
+            cached = self._lookup_child(path)
+            if cached is not None:
+                yield index, cached[0], cached[1]
+                continue
+            hooks = tracing._hooks
+            if hooks:
+                step_start = time.perf_counter()
+            if point is None:
+                point = self.curve.pubkey_to_point(pubkey)
+            _, child_pubkey, child_chaincode = (
+                self.curve.derive_public_child_from_point(
+                    point, pubkey, chaincode, index
+                )
+            )
+            if hooks:
+                tracing._step(hooks, step_start, "public", self.curve, depth, False)
+            self._insert_child(path, child_chaincode, None, child_pubkey)
+            yield index, child_chaincode, child_pubkey
+
+    def _generate_private_children(self, chaincode, privkey, parent_path, indices):
+        depth = self.depth + len(parent_path) + 1
+        # Private derivation of a child only needs a single scalar
+        # multiplication once the parent's pubkey is known.
+        pubkey = None
+        for index in indices:
+            path = parent_path + (index,)
+            cached = self._lookup_child(path)
+            if cached is not None:
+                yield index, cached[0], cached[1]
+                continue
+            hooks = tracing._hooks
+            if hooks:
+                step_start = time.perf_counter()
+            if pubkey is None:
+                pubkey = self.curve.privkey_to_pubkey(privkey)
+                if len(parent_path) > 0:
+                    self._insert_child(parent_path, chaincode, privkey, pubkey)
+            child_privkey, child_chaincode = self.curve.derive_private_child(
+                privkey, chaincode, index, pubkey
+            )
+            child_pubkey = self.curve.privkey_to_pubkey(child_privkey)
+            if hooks:
+                tracing._step(
+                    hooks,
+                    step_start,
+                    "private",
+                    self.curve,
+                    depth,
+                    index & HARDENED_INDEX != 0,
+                )
+            self._insert_child(path, child_chaincode, child_privkey, child_pubkey)
+            yield index, child_chaincode, child_pubkey
+
+    @traced
+    def iter_path_template(self, template):
+        """Lazily derive the extended pubkeys of all the paths of a template.
+
+        The paths are expanded depth-first, so that each intermediate node is
+        derived only once whatever the number of its descendants, and only
+        the current branch of the tree is held in memory.
+
+        :param template: A string with m/x/x'/x notation where each index may
+                         also be a set of indexes and ranges between braces
+                         (e.g. m/84'/0'/{0-99}'/{0,1}/{0-9999}), or a list
+                         with for each depth either an integer or an iterable
+                         of integers (e.g. a range).
+        :return: An iterator of (path (DerivationPath), pubkey (bytes),
+                 chaincode (bytes)), in the order of the template.
+        """
+        try:
+            steps = _get_path_template(template)
+        except ValueError as e:
+            raise InvalidInputError(e) from None
+
+        last_hardened = -1
+        for depth, step in enumerate(steps):
+            if any(len(r) > 0 and max(r) & HARDENED_INDEX for r in step):
+                last_hardened = depth
+        if last_hardened >= 0 and self.privkey is None:
+            raise PrivateDerivationError
+
+        # Derive the leading steps with a single index at once, which may
+        # start from the cache.
+        prefix = []
+        for step in steps:
+            if len(step) != 1 or len(step[0]) != 1:
+                break
+            prefix.append(step[0][0])
+        _, chaincode, privkey, pubkey = self._derive_path(prefix, last_hardened >= 0)
+
+        return self._generate_template(
+            prefix,
+            steps[len(prefix) :],
+            last_hardened - len(prefix),
+            (chaincode, privkey, pubkey, None),
+        )
+
+    def _generate_template(self, prefix, steps, last_hardened, node):
+        """Walk the tree of the paths of a template, depth-first.
+
+        :param prefix: The path to the node to start from.
+        :param steps: The remaining steps of the template, as returned by
+                      _get_path_template().
+        :param last_hardened: The depth of the last step with a hardened
+                              index, relatively to the node. Private derivation
+                              is used up to this step, public derivation after.
+        :param node: The node to start from, as (chaincode, privkey, pubkey,
+                     point). Any but the chaincode may be None.
+        """
+        curve = self.curve
+        if len(steps) == 0:
+            chaincode, privkey, pubkey, _ = node
+            if pubkey is None:
+                pubkey = curve.privkey_to_pubkey(privkey)
+            yield DerivationPath(prefix), pubkey, chaincode
+            return
+
+        path = list(prefix) + [0] * len(steps)
+        leaf_depth = len(steps) - 1
+        # The nodes and the indexes left to derive along the current branch.
+        nodes = [node] + [None] * leaf_depth
+        indexes = [itertools.chain.from_iterable(steps[0])] + [None] * leaf_depth
+        depth = 0
+        while depth >= 0:
+            index = next(indexes[depth], None)
+            if index is None:
+                depth -= 1
+                continue
+
+            chaincode, privkey, pubkey, point = nodes[depth]
+            hooks = tracing._hooks
+            if hooks:
+                step_start = time.perf_counter()
+            if depth <= last_hardened:
+                if pubkey is None and index & HARDENED_INDEX == 0:
+                    pubkey = curve.privkey_to_pubkey(privkey)
+                    nodes[depth] = (chaincode, privkey, pubkey, None)
+                privkey, chaincode = curve.derive_private_child(
+                    privkey, chaincode, index, pubkey
+                )
+                pubkey, point = None, None
+            else:
+                if point is None:
+                    # Only decode (or compute) the pubkey once for all the
+                    # children of this node.
+                    if pubkey is None:
+                        pubkey = curve.privkey_to_pubkey(privkey)
+                    point = curve.pubkey_to_point(pubkey)
+                    nodes[depth] = (chaincode, None, pubkey, point)
+                point, pubkey, chaincode = curve.derive_public_child_from_point(
+                    point, pubkey, chaincode, index
+                )
+                privkey = None
+            if hooks:
+                tracing._step(
+                    hooks,
+                    step_start,
+                    "private" if depth <= last_hardened else "public",
+                    curve,
+                    self.depth + len(prefix) + depth + 1,
+                    index & HARDENED_INDEX != 0,
+                )
+
+            path[len(prefix) + depth] = index
+            if depth == leaf_depth:
+                if pubkey is None:
+                    pubkey = curve.privkey_to_pubkey(privkey)
+                yield DerivationPath(path), pubkey, chaincode
+            else:
+                depth += 1
+                nodes[depth] = (chaincode, privkey, pubkey, point)
+                indexes[depth] = itertools.chain.from_iterable(steps[depth])
+
+    @traced
     def get_xpriv_from_path(self, path):
         """Get an encoded extended privkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: The encoded extended pubkey as str.
         """
         if self.curve.name != "secp256k1":
@@ -244,16 +674,13 @@ class SLIP10:
         if self.privkey is None:
             raise PrivateDerivationError
 
-        if isinstance(path, str):
-            path = _deriv_path_str_to_list(path)
+        path = _get_derivation_path(path)
 
         if len(path) == 0:
             return self.get_xpriv()
-        elif len(path) == 1:
-            parent_pubkey = self.pubkey
-        else:
-            parent_pubkey = self.get_pubkey_from_path(path[:-1])
-        chaincode, privkey = self.get_extended_privkey_from_path(path)
+        parent_pubkey, chaincode, privkey, _ = self._derive_path(
+            path.indexes, True, with_parent=True
+        )
         extended_key = _serialize_extended_key(
             privkey,
             self.depth + len(path),
@@ -263,13 +690,15 @@ class SLIP10:
             self.network,
         )
 
-        return base58.b58encode_check(extended_key).decode()
+        return _b58encode_check(extended_key)
 
+    @traced
     def get_xpub_from_path(self, path):
         """Get an encoded extended pubkey from a derivation path.
 
-        :param path: A list of integers (index of each depth) or a string with
-                     m/x/x'/x notation. (e.g. m/0'/1/2'/2 or m/0H/1/2H/2).
+        :param path: A DerivationPath, a list of integers (index of each depth)
+                     or a string with m/x/x'/x notation. (e.g. m/0'/1/2'/2 or
+                     m/0H/1/2H/2).
         :return: The encoded extended pubkey as str.
         """
         if self.curve.name != "secp256k1":
@@ -277,19 +706,21 @@ class SLIP10:
                 "xpub serialization is supported only for secp256k1"
             )
 
-        if isinstance(path, str):
-            path = _deriv_path_str_to_list(path)
+        path = _get_derivation_path(path)
 
-        if _hardened_index_in_path(path) and self.privkey is None:
+        if path.has_hardened and self.privkey is None:
             raise PrivateDerivationError
 
         if len(path) == 0:
             return self.get_xpub()
-        elif len(path) == 1:
-            parent_pubkey = self.pubkey
-        else:
-            parent_pubkey = self.get_pubkey_from_path(path[:-1])
-        chaincode, pubkey = self.get_extended_pubkey_from_path(path)
+        # We'll need the private key at some point anyway, so let's derive
+        # everything from private keys.
+        private = path.has_hardened
+        parent_pubkey, chaincode, privkey, pubkey = self._derive_path(
+            path.indexes, private, with_parent=True
+        )
+        if pubkey is None:
+            pubkey = self.curve.privkey_to_pubkey(privkey)
         extended_key = _serialize_extended_key(
             pubkey,
             self.depth + len(path),
@@ -299,12 +730,14 @@ class SLIP10:
             self.network,
         )
 
-        return base58.b58encode_check(extended_key).decode()
+        return _b58encode_check(extended_key)
 
+    @traced
     def get_xpriv(self):
         """Get the base58 encoded extended private key."""
-        return base58.b58encode_check(self.get_xpriv_bytes()).decode()
+        return _b58encode_check(self.get_xpriv_bytes())
 
+    @traced
     def get_xpriv_bytes(self):
         """Get the encoded extended private key."""
         if self.curve.name != "secp256k1":
@@ -323,10 +756,12 @@ class SLIP10:
             self.network,
         )
 
+    @traced
     def get_xpub(self):
         """Get the encoded extended public key."""
-        return base58.b58encode_check(self.get_xpub_bytes()).decode()
+        return _b58encode_check(self.get_xpub_bytes())
 
+    @traced
     def get_xpub_bytes(self):
         """Get the encoded extended public key."""
         if self.curve.name != "secp256k1":
@@ -344,63 +779,45 @@ class SLIP10:
         )
 
     @classmethod
-    def from_xpriv(cls, xpriv):
+    @traced
+    def from_xpriv(cls, xpriv, cache=None, validation="full"):
         """Get a SLIP10 "wallet" out of this xpriv
 
         :param xpriv: (str) The encoded serialized extended private key.
+        :param cache: An optional DerivationCache to store intermediate nodes in.
+        :param validation: Either "full", "structural" or "trusted". See
+                           VALIDATION_LEVELS.
         """
-        if not isinstance(xpriv, str):
-            raise InvalidInputError("'xpriv' must be a string")
-
-        extended_key = base58.b58decode_check(xpriv)
-        (
-            network,
-            depth,
-            fingerprint,
-            index,
-            chaincode,
-            key,
-        ) = _unserialize_extended_key(extended_key)
-
-        if key[0] != 0:
-            raise ParsingError("Invalid xpriv: private key prefix must be 0")
-
+        fields = _parse_extended_key(xpriv, private=True)
         try:
-            # We need to remove the trailing `0` before the actual private key !!
-            return SLIP10(chaincode, key[1:], None, fingerprint, depth, index, network)
+            return SLIP10(*fields, cache=cache, validation=validation)
         except InvalidInputError as e:
             raise ParsingError(f"Invalid xpriv: '{e}'")
 
     @classmethod
-    def from_xpub(cls, xpub):
+    @traced
+    def from_xpub(cls, xpub, cache=None, validation="full"):
         """Get a SLIP10 "wallet" out of this xpub
 
         :param xpub: (str) The encoded serialized extended public key.
+        :param cache: An optional DerivationCache to store intermediate nodes in.
+        :param validation: Either "full", "structural" or "trusted". See
+                           VALIDATION_LEVELS.
         """
-        if not isinstance(xpub, str):
-            raise InvalidInputError("'xpub' must be a string")
-
-        extended_key = base58.b58decode_check(xpub)
-        (
-            network,
-            depth,
-            fingerprint,
-            index,
-            chaincode,
-            key,
-        ) = _unserialize_extended_key(extended_key)
-
+        fields = _parse_extended_key(xpub, private=False)
         try:
-            return SLIP10(chaincode, None, key, fingerprint, depth, index, network)
+            return SLIP10(*fields, cache=cache, validation=validation)
         except InvalidInputError as e:
             raise ParsingError(f"Invalid xpub: '{e}'")
 
     @classmethod
-    def from_seed(cls, seed, network="main", curve_name="secp256k1"):
+    @traced
+    def from_seed(cls, seed, network="main", curve_name="secp256k1", cache=None):
         """Get a SLIP10 "wallet" out of this seed seed byte sequence, which can be a BIP39
         binary seed or a SLIP39 master secret.
 
         :param seed: The seed as bytes.
+        :param cache: An optional DerivationCache to store intermediate nodes in.
         """
 
         try:
@@ -410,4 +827,14 @@ class SLIP10:
 
         privkey, chaincode = curve.generate_master(seed)
 
-        return SLIP10(chaincode, privkey, network=network, curve_name=curve_name)
+        if network not in ["main", "test"]:
+            raise InvalidInputError("'network' must be one of 'main' or 'test'")
+
+        return SLIP10(
+            chaincode,
+            privkey,
+            network=network,
+            curve_name=curve_name,
+            cache=cache,
+            validation="trusted",
+        )
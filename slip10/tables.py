@@ -0,0 +1,260 @@
+"""Precomputed tables of multiples of the generator, for the pure Python
+backends.
+
+A table of window w holds d * 2^(w * i) * G for each w bits digit d of a
+scalar, at each position i. A multiplication of the generator then only
+takes one point addition per non-zero digit, instead of the doublings and
+additions of a generic scalar multiplication.
+
+Tables can be saved to a file, and memory-mapped instead of being built:
+loading a table then takes a constant time whatever its window, and its
+pages are shared among the processes using it.
+
+Build and save a table with `python -m slip10.tables`.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+# Windows above 16 bits would take gigabytes.
+MAX_WINDOW = 16
+# The header of a table file: magic, format version, curve name and window.
+# Padded to 32 bytes, and followed by the points as 64 bytes x || y.
+FILE_MAGIC = b"SLIP10GT"
+FILE_VERSION = 1
+FILE_HEADER_STRUCT = struct.Struct(">8sH16sB")
+FILE_HEADER_SIZE = 32
+POINT_SIZE = 64
+
+
+def _ecdsa_curve(curve_name):
+    import ecdsa
+
+    try:
+        return {"secp256k1": ecdsa.SECP256k1, "secp256r1": ecdsa.NIST256p}[curve_name]
+    except KeyError:
+        raise ValueError(f"No generator table for curve '{curve_name}'") from None
+
+
+def table_size(window):
+    """Get the size of a table file, in bytes.
+
+    A table built in memory takes about 2.5 times as much.
+
+    :param window: The window of the table, in bits.
+    """
+    return FILE_HEADER_SIZE + -(-256 // window) * ((1 << window) - 1) * POINT_SIZE
+
+
+def _to_affine(p, points):
+    """Convert Jacobian points to affine coordinates, with a single modular
+    inversion.
+
+    :param points: A list of (X, Y, Z).
+    :return: A list of (x, y).
+    """
+    # Montgomery's trick: invert the product of the Zs, then unroll it.
+    products = []
+    product = 1
+    for _, _, z in points:
+        product = product * z % p
+        products.append(product)
+    inverse = pow(product, -1, p)
+    affine = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        x, y, z = points[i]
+        z_inverse = inverse * products[i - 1] % p if i > 0 else inverse
+        inverse = inverse * z % p
+        z_inverse2 = z_inverse * z_inverse % p
+        affine[i] = (x * z_inverse2 % p, y * z_inverse2 * z_inverse % p)
+    return affine
+
+
+class GeneratorTable:
+    """The multiples of the generator of a curve, by windows of a scalar."""
+
+    def __init__(self, curve_name, window, rows=None, buffer=None):
+        """Use build() or load() instead.
+
+        :param rows: The points of each window position, as lists of (x, y)
+                     ints, for a table in memory.
+        :param buffer: The content of a table file, for a memory-mapped table.
+        """
+        curve = _ecdsa_curve(curve_name)
+        self.curve_name = curve_name
+        self.window = window
+        self.p = curve.curve.p()
+        self.order = curve.order
+        self._rows = rows
+        self._buffer = buffer
+
+    @classmethod
+    def build(cls, curve_name, window=8):
+        """Compute the table of a curve.
+
+        :param curve_name: Either "secp256k1" or "secp256r1".
+        :param window: The window, in bits. Larger windows make
+                       multiplications faster, but the size of the table
+                       doubles with each bit. See table_size().
+        :return: GeneratorTable
+        """
+        if not isinstance(window, int) or not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"'window' must be between 1 and {MAX_WINDOW}")
+        p = _ecdsa_curve(curve_name).curve.p()
+        base = _ecdsa_curve(curve_name).generator
+        rows = []
+        for _ in range(-(-256 // window)):
+            # d * base for d in [1, 2^w - 1]: a doubling, then additions of
+            # the base, which never get the special cases.
+            bx, by = base.x(), base.y()
+            points = [(bx, by, 1)]
+            if window > 1:
+                double = base.double()
+                points.append((double.x(), double.y(), 1))
+            for _ in range(3, 1 << window):
+                points.append(_add_mixed(p, *points[-1], bx, by))
+            rows.append(_to_affine(p, points))
+            for _ in range(window):
+                base = base.double()
+        return cls(curve_name, window, rows=rows)
+
+    @classmethod
+    def load(cls, path, curve_name=None):
+        """Memory-map a table file.
+
+        Its header, and the first point of each window position, are
+        checked.
+
+        :param path: The path to a file written by save().
+        :param curve_name: The curve the table must be for, if any.
+        :return: GeneratorTable
+        """
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER_STRUCT.size)
+            if len(header) < FILE_HEADER_STRUCT.size:
+                raise ValueError("Not a generator table file")
+            magic, version, name, window = FILE_HEADER_STRUCT.unpack(header)
+            name = name.rstrip(b"\x00").decode("ascii", "replace")
+            if magic != FILE_MAGIC or version != FILE_VERSION:
+                raise ValueError("Not a generator table file")
+            if curve_name is not None and name != curve_name:
+                raise ValueError(f"The table is for curve '{name}'")
+            if not 1 <= window <= MAX_WINDOW:
+                raise ValueError("Invalid window")
+            if os.fstat(f.fileno()).st_size != table_size(window):
+                raise ValueError("Invalid table size")
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        table = cls(name, window, buffer=buffer)
+        base = _ecdsa_curve(name).generator
+        for i in range(-(-256 // window)):
+            if table._get(i, 1) != (base.x(), base.y()):
+                raise ValueError("Invalid table")
+            for _ in range(window):
+                base = base.double()
+        return table
+
+    def save(self, path):
+        """Write the table to a file, to load() it later.
+
+        :param path: The path to the file.
+        """
+        header = FILE_HEADER_STRUCT.pack(
+            FILE_MAGIC, FILE_VERSION, self.curve_name.encode(), self.window
+        )
+        with open(path, "wb") as f:
+            f.write(header.ljust(FILE_HEADER_SIZE, b"\x00"))
+            if self._buffer is not None:
+                f.write(self._buffer[FILE_HEADER_SIZE:])
+                return
+            for row in self._rows:
+                f.write(
+                    b"".join(
+                        x.to_bytes(32, "big") + y.to_bytes(32, "big") for x, y in row
+                    )
+                )
+
+    def _get(self, position, digit):
+        """Get digit * 2^(w * position) * G, as (x, y)."""
+        if self._rows is not None:
+            return self._rows[position][digit - 1]
+        offset = (
+            FILE_HEADER_SIZE
+            + (position * ((1 << self.window) - 1) + digit - 1) * POINT_SIZE
+        )
+        buffer = self._buffer
+        return (
+            int.from_bytes(buffer[offset : offset + 32], "big"),
+            int.from_bytes(buffer[offset + 32 : offset + 64], "big"),
+        )
+
+    def multiply(self, scalar):
+        """Multiply the generator by a scalar.
+
+        :param scalar: The scalar, as int.
+        :return: The affine coordinates (x, y) of the product, as ints, or
+                 None if it is the point at infinity.
+        """
+        scalar %= self.order
+        p = self.p
+        window = self.window
+        mask = (1 << window) - 1
+        get = self._get
+        # With 0 < scalar < order, the partial sum s and the multiple d * 2^k
+        # added to it verify 0 < s < d * 2^k and s + d * 2^k < order: they
+        # are never equal nor opposite, and the sum is never the point at
+        # infinity.
+        X = None
+        position = 0
+        while scalar:
+            digit = scalar & mask
+            if digit:
+                x2, y2 = get(position, digit)
+                if X is None:
+                    X, Y, Z = x2, y2, 1
+                else:
+                    X, Y, Z = _add_mixed(p, X, Y, Z, x2, y2)
+            scalar >>= window
+            position += 1
+        if X is None:
+            return None
+        return _to_affine(p, [(X, Y, Z)])[0]
+
+
+def _add_mixed(p, X, Y, Z, x2, y2):
+    """Add a point in affine coordinates to a point in Jacobian coordinates.
+
+    The points must be neither equal, opposite nor the point at infinity.
+    """
+    ZZ = Z * Z % p
+    H = (x2 * ZZ - X) % p
+    r = (y2 * ZZ * Z - Y) % p
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    return X3, (r * (V - X3) - Y * HHH) % p, Z * H % p
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m slip10.tables",
+        description="Build a table of multiples of a curve's generator, and save "
+        "it to a file to be memory-mapped.",
+    )
+    parser.add_argument("curve", choices=["secp256k1", "secp256r1"])
+    parser.add_argument("path", help="The file to write the table to.")
+    parser.add_argument(
+        "--window", type=int, default=8, help="The window, in bits (default: 8)."
+    )
+    args = parser.parse_args(argv)
+    if not 1 <= args.window <= MAX_WINDOW:
+        parser.error(f"--window must be between 1 and {MAX_WINDOW}")
+    GeneratorTable.build(args.curve, args.window).save(args.path)
+    print(f"Wrote {table_size(args.window)} bytes to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
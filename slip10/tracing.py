@@ -0,0 +1,137 @@
+"""Hooks to time the public SLIP10 calls and each derivation step.
+
+A hook is a callable taking a Span. It is called synchronously, from the
+thread which performed the operation, once the operation is done. When no
+hook is registered, tracing only costs a check of the hooks per call and
+per step.
+
+Only the outermost call is reported: the calls it makes to other public
+methods are part of its span. The span of a method returning an iterator
+(iter_children(), iter_path_template()) only times its setup, i.e. the
+derivation of the nodes the iteration starts from. The derivations made as
+the iterator is consumed are reported as steps.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+Span = collections.namedtuple(
+    "Span",
+    ("kind", "name", "curve", "backend", "depth", "hardened", "start", "duration"),
+)
+Span.__doc__ = """A timed operation.
+
+- kind: Either "call" for a public SLIP10 call, or "step" for a derivation
+  step.
+- name: The name of the SLIP10 method, or "private" or "public" for a
+  private or public derivation step.
+- curve: The name of the curve, or None if a call failed before it was known.
+- backend: The name of the curve's backend, or None for the Edwards curves.
+- depth: The depth of the node the call was made on, or of the derived node
+  for a step.
+- hardened: Whether the step derived a hardened child (None for a call).
+- start: The time.perf_counter() value at the start of the operation.
+- duration: The duration of the operation, in seconds.
+"""
+
+# A tuple, replaced on each change, so that a call sees the same hooks from
+# its beginning to its end.
+_hooks = ()
+# Whether a traced call is in progress in this thread.
+_local = threading.local()
+
+
+def add_hook(hook):
+    """Register a function to be called with the Span of each operation."""
+    global _hooks
+    _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook):
+    """Unregister a function registered with add_hook()."""
+    global _hooks
+    hooks = list(_hooks)
+    hooks.remove(hook)
+    _hooks = tuple(hooks)
+
+
+@contextlib.contextmanager
+def trace(hook):
+    """Register a hook for the duration of a with block.
+
+    >>> with trace(spans.append):
+    ...     slip10.get_xpub_from_path("m/0h/1")
+    """
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
+
+
+def _backend_name(curve):
+    backend = getattr(curve, "backend", None)
+    return None if backend is None else backend.name
+
+
+def _emit(hooks, span):
+    for hook in hooks:
+        hook(span)
+
+
+def _step(hooks, start, name, curve, depth, hardened):
+    """Report a derivation step which started at `start`.
+
+    :param name: Either "private" or "public".
+    """
+    span = Span(
+        "step",
+        name,
+        curve.name,
+        _backend_name(curve),
+        depth,
+        hardened,
+        start,
+        time.perf_counter() - start,
+    )
+    _emit(hooks, span)
+
+
+def traced(method):
+    """Report a Span for each call of a SLIP10 method (or classmethod)."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        hooks = _hooks
+        if not hooks or getattr(_local, "in_call", False):
+            return method(*args, **kwargs)
+
+        result = None
+        _local.in_call = True
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+            return result
+        finally:
+            end = time.perf_counter()
+            _local.in_call = False
+            # For a classmethod, report the node it returned.
+            node = args[0] if hasattr(args[0], "curve") else result
+            curve = getattr(node, "curve", None)
+            span = Span(
+                "call",
+                name,
+                getattr(curve, "name", None),
+                _backend_name(curve),
+                getattr(node, "depth", None),
+                None,
+                start,
+                end - start,
+            )
+            _emit(hooks, span)
+
+    return wrapper
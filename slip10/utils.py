@@ -1,19 +1,28 @@
+import functools
 import hashlib
 import hmac
+import importlib
 import re
+import struct
 
-import ecdsa
-from cryptography.hazmat.primitives.asymmetric.ed25519 import (
-    Ed25519PrivateKey,
-    Ed25519PublicKey,
-)
-from cryptography.hazmat.primitives.asymmetric.x25519 import (
-    X25519PrivateKey,
-    X25519PublicKey,
-)
+from . import counters
+from .backends import load_backend
 
 REGEX_DERIVATION_PATH = re.compile("^m(/[0-9]+['hH]?)*$")
+# Like a derivation path, but each index may also be a set of indexes and
+# ranges of indexes, e.g. m/84'/0'/{0-9}'/{0,1}/{0-99,200}
+REGEX_PATH_TEMPLATE = re.compile(
+    r"^m(/([0-9]+|\{[0-9]+(-[0-9]+)?(,[0-9]+(-[0-9]+)?)*\})['hH]?)*$"
+)
 HARDENED_INDEX = 0x80000000
+# version, depth, parent fingerprint, index, chaincode, key (prefixed by a
+# zero byte for a private key).
+EXTENDED_KEY_STRUCT = struct.Struct(">IB4sI32s33s")
+B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# All the pairs of base58 digits (58 ** 2 == 3364), and 58 ** 10.
+B58_PAIRS = [a + b for a in B58_ALPHABET for b in B58_ALPHABET]
+B58_PAIR_VALUES = {pair: value for value, pair in enumerate(B58_PAIRS)}
+B58_CHUNK = 58**10
 ENCODING_PREFIX = {
     "main": {
         "private": 0x0488ADE4,
@@ -25,16 +34,41 @@ ENCODING_PREFIX = {
     },
 }
 
+# The network of each version prefix.
+PREFIX_NETWORKS = {
+    prefix: network
+    for network, prefixes in ENCODING_PREFIX.items()
+    for prefix in prefixes.values()
+}
+
 
 class SLIP10DerivationError(Exception):
     pass
 
 
 class WeierstrassCurve:
-    def __init__(self, name, modifier, curve):
+    def __init__(self, name, modifier, order, backend=None):
+        """
+        :param name: The name of the curve.
+        :param modifier: The HMAC key for master key generation, as bytes.
+        :param order: The order of the curve's generator, as int.
+        :param backend: The backend used for elliptic curve arithmetic. If None,
+                        the preferred available backend is loaded on first use.
+        """
         self.name = name
         self.modifier = modifier
-        self.curve = curve
+        self.order = order
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = load_backend(self.name)
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend):
+        self._backend = backend
 
     def generate_master(self, seed):
         """Master key generation in SLIP-0010
@@ -44,17 +78,21 @@ class WeierstrassCurve:
         :return: (master_privatekey, master_chaincode)
         """
         while True:
+            counters.count("hmac_sha512")
             payload = hmac.new(self.modifier, seed, hashlib.sha512).digest()
             if self.privkey_is_valid(payload[:32]):
                 return payload[:32], payload[32:]
+            counters.count("retries")
             seed = payload
 
-    def derive_private_child(self, privkey, chaincode, index):
+    def derive_private_child(self, privkey, chaincode, index, pubkey=None):
         """A.k.a CKDpriv, in SLIP-0010, but the hardened way
 
         :param privkey: The parent's private key, as bytes
         :param chaincode: The parent's chaincode, as bytes
         :param index: The index of the node to derive, as int
+        :param pubkey: The parent's (compressed) public key, as bytes. Optional,
+                       computed from the private key if needed and not given.
 
         :return: (child_privatekey, child_chaincode)
         """
@@ -65,16 +103,20 @@ class WeierstrassCurve:
                 chaincode, b"\x00" + privkey + index.to_bytes(4, "big"), hashlib.sha512
             ).digest()
         else:
-            pubkey = self.privkey_to_pubkey(privkey)
+            if pubkey is None:
+                pubkey = self.privkey_to_pubkey(privkey)
             payload = hmac.new(
                 chaincode, pubkey + index.to_bytes(4, "big"), hashlib.sha512
             ).digest()
+        counters.count("hmac_sha512")
 
         while True:
             tweak = int.from_bytes(payload[:32], "big")
-            child_private = (tweak + int.from_bytes(privkey, "big")) % self.curve.order
-            if tweak <= self.curve.order and child_private != 0:
+            child_private = (tweak + int.from_bytes(privkey, "big")) % self.order
+            if tweak <= self.order and child_private != 0:
                 break
+            counters.count("retries")
+            counters.count("hmac_sha512")
             payload = hmac.new(
                 chaincode,
                 b"\x01" + payload[32:] + index.to_bytes(4, "big"),
@@ -92,51 +134,120 @@ class WeierstrassCurve:
 
         :return: (child_pubkey, child_chaincode)
         """
-        from ecdsa.ellipticcurve import INFINITY
-
         assert isinstance(pubkey, bytes) and isinstance(chaincode, bytes)
+        _, child_pubkey, child_chaincode = self.derive_public_child_from_point(
+            self.pubkey_to_point(pubkey), pubkey, chaincode, index
+        )
+        return child_pubkey, child_chaincode
+
+    def derive_public_child_from_point(self, point, pubkey, chaincode, index):
+        """CKDpub on an already decoded public key.
+
+        This avoids decompressing the parent's public key (a modular square
+        root) when it was itself obtained by derivation, or when deriving many
+        of its children.
+
+        :param point: The parent's public key, as returned by pubkey_to_point()
+        :param pubkey: The parent's (compressed) public key, as bytes
+        :param chaincode: The parent's chaincode, as bytes
+        :param index: The index of the node to derive, as int
+
+        :return: (child_point, child_pubkey, child_chaincode)
+        """
         if index & HARDENED_INDEX != 0:
             raise SLIP10DerivationError("Hardened derivation is not possible.")
 
         # payload is the I from the SLIP. Index is 32 bits unsigned int, BE.
+        counters.count("hmac_sha512")
         payload = hmac.new(
             chaincode, pubkey + index.to_bytes(4, "big"), hashlib.sha512
         ).digest()
         while True:
             tweak = int.from_bytes(payload[:32], "big")
-            point = ecdsa.VerifyingKey.from_string(pubkey, self.curve).pubkey.point
-            point += self.curve.generator * tweak
-            if tweak <= self.curve.order and point != INFINITY:
-                break
+            if tweak <= self.order:
+                counters.count("scalar_multiplications")
+                child_point = self.backend.point_add_tweak(point, tweak)
+                if child_point is not None:
+                    break
+            counters.count("retries")
+            counters.count("hmac_sha512")
             payload = hmac.new(
                 chaincode,
                 b"\x01" + payload[32:] + index.to_bytes(4, "big"),
                 hashlib.sha512,
             ).digest()
-        return point.to_bytes("compressed"), payload[32:]
+        return child_point, self.backend.point_to_pubkey(child_point), payload[32:]
+
+    def pubkey_to_point(self, pubkey):
+        """Decode a public key to a point on the curve.
+
+        :param pubkey: The public key, as bytes
+
+        :return: The point, to be used with derive_public_child_from_point()
+        """
+        counters.count("point_decompressions")
+        return self.backend.pubkey_to_point(pubkey)
+
+    def point_to_pubkey(self, point):
+        """Encode a point on the curve to a compressed public key.
+
+        :param point: The point, as returned by pubkey_to_point() or
+                      derive_public_child_from_point()
+
+        :return: The compressed public key, as bytes
+        """
+        return self.backend.point_to_pubkey(point)
 
     def privkey_is_valid(self, privkey):
         key = int.from_bytes(privkey, "big")
-        return 0 < key < self.curve.order
+        return 0 < key < self.order
 
     def pubkey_is_valid(self, pubkey):
-        try:
-            ecdsa.VerifyingKey.from_string(pubkey, self.curve)
-            return True
-        except ecdsa.errors.MalformedPointError:
-            return False
+        counters.count("point_decompressions")
+        return self.backend.pubkey_is_valid(pubkey)
+
+    def pubkey_is_well_formed(self, pubkey):
+        """Check the encoding of a compressed public key, but not whether it is
+        actually on the curve."""
+        return len(pubkey) == 33 and pubkey[0] in (2, 3)
 
     def privkey_to_pubkey(self, privkey):
-        sk = ecdsa.SigningKey.from_string(privkey, self.curve)
-        return sk.get_verifying_key().to_string("compressed")
+        counters.count("scalar_multiplications")
+        return self.backend.privkey_to_pubkey(privkey)
 
 
 class EdwardsCurve:
-    def __init__(self, name, modifier, private_key_class, public_key_class):
+    def __init__(self, name, modifier, module, key_prefix):
+        """
+        :param name: The name of the curve.
+        :param modifier: The HMAC key for master key generation, as bytes.
+        :param module: The cryptography module implementing the curve, which
+                       is only imported on first use.
+        :param key_prefix: The prefix of the names of the module's private and
+                           public key classes.
+        """
         self.name = name
         self.modifier = modifier
-        self.private_key_class = private_key_class
-        self.public_key_class = public_key_class
+        self.module = module
+        self.key_prefix = key_prefix
+        self._key_classes = None
+
+    def _load_key_classes(self):
+        if self._key_classes is None:
+            module = importlib.import_module(self.module)
+            self._key_classes = (
+                getattr(module, self.key_prefix + "PrivateKey"),
+                getattr(module, self.key_prefix + "PublicKey"),
+            )
+        return self._key_classes
+
+    @property
+    def private_key_class(self):
+        return self._load_key_classes()[0]
+
+    @property
+    def public_key_class(self):
+        return self._load_key_classes()[1]
 
     def generate_master(self, seed):
         """Master key generation in SLIP-0010
@@ -145,15 +256,17 @@ class EdwardsCurve:
 
         :return: (master_privatekey, master_chaincode)
         """
+        counters.count("hmac_sha512")
         secret = hmac.new(self.modifier, seed, hashlib.sha512).digest()
         return secret[:32], secret[32:]
 
-    def derive_private_child(self, privkey, chaincode, index):
+    def derive_private_child(self, privkey, chaincode, index, pubkey=None):
         """A.k.a CKDpriv, in SLIP-0010, but the hardened way
 
         :param privkey: The parent's private key, as bytes
         :param chaincode: The parent's chaincode, as bytes
         :param index: The index of the node to derive, as int
+        :param pubkey: Unused, only hardened derivation is supported.
 
         :return: (child_privatekey, child_chaincode)
         """
@@ -162,6 +275,7 @@ class EdwardsCurve:
         if index & HARDENED_INDEX == 0:
             raise SLIP10DerivationError("Normal derivation is not supported.")
 
+        counters.count("hmac_sha512")
         payload = hmac.new(
             chaincode, b"\x00" + privkey + index.to_bytes(4, "big"), hashlib.sha512
         ).digest()
@@ -171,6 +285,16 @@ class EdwardsCurve:
     def derive_public_child(self, pubkey, chaincode, index):
         raise SLIP10DerivationError("Normal derivation is not supported.")
 
+    def derive_public_child_from_point(self, point, pubkey, chaincode, index):
+        raise SLIP10DerivationError("Normal derivation is not supported.")
+
+    def pubkey_to_point(self, pubkey):
+        # There is no public derivation, hence no need for a decoded point.
+        return pubkey
+
+    def point_to_pubkey(self, point):
+        return point
+
     def privkey_is_valid(self, privkey):
         try:
             self.private_key_class.from_private_bytes(privkey)
@@ -188,20 +312,44 @@ class EdwardsCurve:
             return False
         return True
 
+    def pubkey_is_well_formed(self, pubkey):
+        """Check the encoding of a public key, but not whether it is actually
+        on the curve."""
+        return len(pubkey) == 33 and pubkey[0] == 0
+
     def privkey_to_pubkey(self, privkey):
         from cryptography.hazmat.primitives import serialization
 
+        counters.count("scalar_multiplications")
         sk = self.private_key_class.from_private_bytes(privkey)
         key_encoding = serialization.Encoding.Raw
         key_format = serialization.PublicFormat.Raw
         return b"\x00" + sk.public_key().public_bytes(key_encoding, key_format)
 
 
-SECP256K1 = WeierstrassCurve("secp256k1", b"Bitcoin seed", ecdsa.SECP256k1)
-SECP256R1 = WeierstrassCurve("secp256r1", b"Nist256p1 seed", ecdsa.NIST256p)
-ED25519 = EdwardsCurve("ed25519", b"ed25519 seed", Ed25519PrivateKey, Ed25519PublicKey)
+# The curves only hold their parameters: the packages implementing them are
+# imported on first use.
+SECP256K1 = WeierstrassCurve(
+    "secp256k1",
+    b"Bitcoin seed",
+    0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
+)
+SECP256R1 = WeierstrassCurve(
+    "secp256r1",
+    b"Nist256p1 seed",
+    0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+)
+ED25519 = EdwardsCurve(
+    "ed25519",
+    b"ed25519 seed",
+    "cryptography.hazmat.primitives.asymmetric.ed25519",
+    "Ed25519",
+)
 X25519 = EdwardsCurve(
-    "curve25519", b"curve25519 seed", X25519PrivateKey, X25519PublicKey
+    "curve25519",
+    b"curve25519 seed",
+    "cryptography.hazmat.primitives.asymmetric.x25519",
+    "X25519",
 )
 CURVES = (SECP256K1, SECP256R1, ED25519, X25519)
 
@@ -229,8 +377,13 @@ def _ripemd160(data):
         return ripemd160.ripemd160(data)
 
 
+def _hash160(data):
+    return _ripemd160(hashlib.sha256(data).digest())
+
+
 def _pubkey_to_fingerprint(pubkey):
-    return _ripemd160(hashlib.sha256(pubkey).digest())[:4]
+    counters.count("fingerprints")
+    return _hash160(pubkey)[:4]
 
 
 def _serialize_extended_key(key, depth, parent, index, chaincode, network="main"):
@@ -246,10 +399,8 @@ def _serialize_extended_key(key, depth, parent, index, chaincode, network="main"
 
     :return: The serialized extended key.
     """
-    for param in {key, chaincode}:
-        assert isinstance(param, bytes)
-    for param in {depth, index}:
-        assert isinstance(param, int)
+    assert isinstance(key, bytes) and isinstance(chaincode, bytes)
+    assert isinstance(depth, int) and isinstance(index, int)
     if parent:
         assert isinstance(parent, bytes)
         if len(parent) == 33:
@@ -261,20 +412,80 @@ def _serialize_extended_key(key, depth, parent, index, chaincode, network="main"
     else:
         fingerprint = bytes(4)  # master
     # A privkey or a compressed pubkey
-    assert len(key) in {32, 33}
-    if network not in {"main", "test"}:
+    assert len(key) in (32, 33)
+    if network not in ENCODING_PREFIX:
         raise ValueError("Unsupported network")
     is_privkey = len(key) == 32
     prefix = ENCODING_PREFIX[network]["private" if is_privkey else "public"]
-    extended = prefix.to_bytes(4, "big")
-    extended += depth.to_bytes(1, "big")
-    extended += fingerprint
-    extended += index.to_bytes(4, "big")
-    extended += chaincode
-    if is_privkey:
-        extended += b"\x00"
-    extended += key
-    return extended
+    return EXTENDED_KEY_STRUCT.pack(
+        prefix,
+        depth,
+        fingerprint,
+        index,
+        chaincode,
+        b"\x00" + key if is_privkey else key,
+    )
+
+
+def _b58encode_check(data):
+    """Base58Check encode some data, as str.
+
+    Equivalent to base58.b58encode_check(data).decode(), but the digits are
+    extracted ten at a time, which is a lot faster for short data such as
+    extended keys.
+    """
+    data += hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+    value = int.from_bytes(data, "big")
+    chunks = []
+    while value:
+        value, chunk = divmod(value, B58_CHUNK)
+        chunks.append(chunk)
+    digits = []
+    for chunk in reversed(chunks):
+        chunk, d4 = divmod(chunk, 3364)
+        chunk, d3 = divmod(chunk, 3364)
+        chunk, d2 = divmod(chunk, 3364)
+        d0, d1 = divmod(chunk, 3364)
+        digits += (
+            B58_PAIRS[d0],
+            B58_PAIRS[d1],
+            B58_PAIRS[d2],
+            B58_PAIRS[d3],
+            B58_PAIRS[d4],
+        )
+    # Each leading zero byte is encoded as a "1", the other leading zeros
+    # are dropped.
+    zeros = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * zeros + "".join(digits).lstrip("1")
+
+
+def _b58decode_check(string):
+    """Decode some Base58Check encoded data, and verify its checksum.
+
+    Equivalent to base58.b58decode_check(string), but the digits are decoded
+    ten at a time.
+
+    :raise ValueError: If the string contains an invalid character, or if
+                       the checksum does not match.
+    """
+    string = string.rstrip()
+    # Leading "1"s don't change the value, make the length a multiple of 10.
+    padded = "1" * (-len(string) % 10) + string
+    value = 0
+    try:
+        for i in range(0, len(padded), 10):
+            chunk = B58_PAIR_VALUES[padded[i : i + 2]]
+            for j in range(i + 2, i + 10, 2):
+                chunk = chunk * 3364 + B58_PAIR_VALUES[padded[j : j + 2]]
+            value = value * B58_CHUNK + chunk
+    except KeyError:
+        raise ValueError("Invalid character") from None
+    zeros = len(string) - len(string.lstrip("1"))
+    data = bytes(zeros) + value.to_bytes((value.bit_length() + 7) // 8, "big")
+    data, checksum = data[:-4], data[-4:]
+    if hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4] != checksum:
+        raise ValueError("Invalid checksum")
+    return data
 
 
 def _unserialize_extended_key(extended_key):
@@ -286,16 +497,10 @@ def _unserialize_extended_key(extended_key):
              chaincode (bytes), key (bytes)
     """
     assert isinstance(extended_key, bytes) and len(extended_key) == 78
-    prefix = int.from_bytes(extended_key[:4], "big")
-    network = None
-    if prefix in list(ENCODING_PREFIX["main"].values()):
-        network = "main"
-    elif prefix in list(ENCODING_PREFIX["test"].values()):
-        network = "test"
-    depth = extended_key[4]
-    fingerprint = extended_key[5:9]
-    index = int.from_bytes(extended_key[9:13], "big")
-    chaincode, key = extended_key[13:45], extended_key[45:]
+    prefix, depth, fingerprint, index, chaincode, key = EXTENDED_KEY_STRUCT.unpack(
+        extended_key
+    )
+    network = PREFIX_NETWORKS.get(prefix)
     return network, depth, fingerprint, index, chaincode, key
 
 
@@ -323,3 +528,172 @@ def _deriv_path_str_to_list(strpath):
         else:
             list_path.append(int(i))
     return list_path
+
+
+def _path_template_str_to_list(strtemplate):
+    """Converts a derivation path template as string to a list of steps
+
+    :param strtemplate: Derivation path template as string with "m/x/x'/x"
+                        notation, where each index may also be a set of
+                        indexes and ranges of indexes between braces.
+                        (e.g. m/84'/0'/{0-9}'/{0,1}/{0-99,200})
+
+    :return: A list of steps (one per depth), each a tuple of ranges of
+             indexes.
+    """
+    if not REGEX_PATH_TEMPLATE.match(strtemplate):
+        raise ValueError("invalid format")
+    steps = []
+    for step in strtemplate.split("/")[1:]:
+        offset = 0
+        if step[-1:] in ["'", "h", "H"]:
+            offset = HARDENED_INDEX
+            step = step[:-1]
+        ranges = []
+        for item in step.strip("{}").split(","):
+            first, _, last = item.partition("-")
+            first = int(first)
+            last = int(last) if last else first
+            if last < first or last >= HARDENED_INDEX:
+                raise ValueError("invalid index range")
+            ranges.append(range(first + offset, last + offset + 1))
+        steps.append(tuple(ranges))
+    return steps
+
+
+def _get_path_template(template):
+    """Get the steps of a derivation path template.
+
+    :param template: A string with m/x/{x-y}'/{x,y} notation, or a list with
+                     for each depth either an integer or an iterable of
+                     integers (e.g. a range).
+
+    :return: A tuple of steps (one per depth), each a tuple of ranges of
+             indexes.
+    """
+    if isinstance(template, str):
+        return tuple(_path_template_str_to_list(template))
+
+    steps = []
+    for step in template:
+        if isinstance(step, int):
+            ranges = (range(step, step + 1),)
+        elif isinstance(step, range):
+            ranges = (step,)
+        else:
+            ranges = tuple(range(index, index + 1) for index in step)
+        for indexes in ranges:
+            if len(indexes) > 0 and (
+                min(indexes) < 0 or max(indexes) >= 2 * HARDENED_INDEX
+            ):
+                raise ValueError("invalid index")
+        steps.append(ranges)
+    return tuple(steps)
+
+
+class DerivationPath:
+    """An immutable, parsed, derivation path.
+
+    The hardened steps and the parent path are computed once, and it is
+    hashable so it can be used as a dict key. Every SLIP10 method accepting a
+    path accepts a DerivationPath.
+    """
+
+    __slots__ = ("indexes", "hardened", "last_hardened", "_parent", "_hash")
+
+    def __init__(self, indexes):
+        """
+        :param indexes: An iterable of integers (index of each depth).
+        """
+        indexes = tuple(indexes)
+        for index in indexes:
+            if not isinstance(index, int) or not 0 <= index < 2 * HARDENED_INDEX:
+                raise ValueError("invalid index")
+        hardened = tuple(index & HARDENED_INDEX != 0 for index in indexes)
+        last_hardened = -1
+        for depth, is_hardened in enumerate(hardened):
+            if is_hardened:
+                last_hardened = depth
+
+        object.__setattr__(self, "indexes", indexes)
+        object.__setattr__(self, "hardened", hardened)
+        object.__setattr__(self, "last_hardened", last_hardened)
+        object.__setattr__(self, "_parent", None)
+        object.__setattr__(self, "_hash", hash(indexes))
+
+    @classmethod
+    def from_str(cls, strpath):
+        """Parse a derivation path in "m/x/x'/x" notation.
+
+        The parsed paths are cached, so parsing the same string again is cheap.
+        """
+        return _parse_deriv_path_str(strpath)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'DerivationPath' object is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("'DerivationPath' object is immutable")
+
+    @property
+    def has_hardened(self):
+        """Whether the path contains a hardened index."""
+        return self.last_hardened >= 0
+
+    @property
+    def parent(self):
+        """The path to the parent node, or None for an empty path."""
+        if self._parent is None and len(self.indexes) > 0:
+            object.__setattr__(self, "_parent", DerivationPath(self.indexes[:-1]))
+        return self._parent
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self):
+        return iter(self.indexes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return DerivationPath(self.indexes[key])
+        return self.indexes[key]
+
+    def __eq__(self, other):
+        if not isinstance(other, DerivationPath):
+            return NotImplemented
+        return self.indexes == other.indexes
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (DerivationPath, (self.indexes,))
+
+    def __str__(self):
+        return "m" + "".join(
+            f"/{index & ~HARDENED_INDEX}h" if is_hardened else f"/{index}"
+            for index, is_hardened in zip(self.indexes, self.hardened)
+        )
+
+    def __repr__(self):
+        return f"DerivationPath('{self}')"
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_deriv_path_str(strpath):
+    return DerivationPath(_deriv_path_str_to_list(strpath))
+
+
+def _get_derivation_path(path):
+    """Get a DerivationPath out of any of the accepted path formats.
+
+    :param path: A DerivationPath, a list of integers (index of each depth) or
+                 a string with m/x/x'/x notation.
+
+    :return: DerivationPath
+    """
+    if isinstance(path, DerivationPath):
+        return path
+    if isinstance(path, str):
+        return _parse_deriv_path_str(path)
+    return DerivationPath(path)
@@ -0,0 +1,18 @@
+import pytest
+
+from slip10.backends import available_backends, set_backend
+
+BACKEND_NAMES = sorted(
+    set(available_backends("secp256k1")) | set(available_backends("secp256r1"))
+)
+
+
+@pytest.fixture(autouse=True, params=BACKEND_NAMES)
+def backend(request):
+    """Run every test with each of the available elliptic curve backends."""
+    for curve_name in ("secp256k1", "secp256r1"):
+        if request.param in available_backends(curve_name):
+            set_backend(curve_name, request.param)
+    yield request.param
+    for curve_name in ("secp256k1", "secp256r1"):
+        set_backend(curve_name)
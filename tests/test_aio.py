@@ -0,0 +1,105 @@
+import asyncio
+import random
+
+import pytest
+
+from slip10 import HARDENED_INDEX, SLIP10, PrivateDerivationError
+from slip10.aio import AsyncSLIP10, scan_account
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_scan_account():
+    account = SLIP10.from_xpub(SLIP10.from_seed(bytes.fromhex(SEED_1)).get_xpub())
+    used = {0: {0, 1, 5, 24, 30}, 1: {3}, 2: set()}
+    in_flight, max_in_flight = 0, 0
+    looked_up = {0: [], 1: [], 2: []}
+
+    async def is_used(chain, index, pubkey):
+        nonlocal in_flight, max_in_flight
+        assert pubkey == account.get_pubkey_from_path([chain, index])
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(random.random() / 1000)
+        in_flight -= 1
+        looked_up[chain].append(index)
+        return index in used[chain]
+
+    result = asyncio.run(
+        scan_account(
+            account,
+            is_used,
+            gap_limit=10,
+            chains=(0, 1, 2),
+            batch_size=7,
+            max_in_flight=4,
+        )
+    )
+    assert {chain: [i for i, _ in result[chain]] for chain in result} == {
+        0: [0, 1, 5],
+        1: [3],
+        2: [],
+    }
+    assert result[1] == [(3, account.get_pubkey_from_path([1, 3]))]
+    # Stopped at the gap limit
+    assert sorted(looked_up[0]) == list(range(16))
+    assert sorted(looked_up[1]) == list(range(14))
+    assert sorted(looked_up[2]) == list(range(10))
+    assert 0 < max_in_flight <= 4
+
+    with pytest.raises(ValueError):
+        asyncio.run(scan_account(account, is_used, gap_limit=0))
+
+
+def test_async_slip10():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    calls = []
+    get_xpub_from_path = slip10.get_xpub_from_path
+    slip10.get_xpub_from_path = lambda path: calls.append(path) or get_xpub_from_path(
+        path
+    )
+    async_slip10 = AsyncSLIP10(slip10)
+
+    async def main():
+        # Identical concurrent requests are coalesced.
+        xpubs = await asyncio.gather(
+            *(
+                async_slip10.get_xpub_from_path(p)
+                for p in ("m/0h/1", [HARDENED_INDEX, 1]) * 5
+            )
+        )
+        assert xpubs == [get_xpub_from_path("m/0h/1")] * 10
+        assert len(calls) == 1
+        await async_slip10.get_xpub_from_path("m/0h/1")
+        assert len(calls) == 2
+        assert async_slip10._pending == {}
+
+        assert await async_slip10.get_xpriv_from_path(
+            "m/1"
+        ) == slip10.get_xpriv_from_path("m/1")
+        assert await async_slip10.get_pubkey_from_path(
+            "m/1h/2"
+        ) == slip10.get_pubkey_from_path("m/1h/2")
+        assert await async_slip10.get_privkey_from_path(
+            "m/1"
+        ) == slip10.get_privkey_from_path("m/1")
+        child = await async_slip10.get_child_from_path("m/2")
+        assert child.get_xpub() == get_xpub_from_path("m/2")
+        assert await async_slip10.derive_children(
+            "m/0h", range(3)
+        ) == slip10.derive_children("m/0h", range(3))
+        paths = [p async for p in async_slip10.iter_path_template("m/{0-4}/{0,1}", 3)]
+        assert paths == list(slip10.iter_path_template("m/{0-4}/{0,1}"))
+
+        xpub_slip10 = AsyncSLIP10(SLIP10.from_xpub(slip10.get_xpub()))
+        results = await asyncio.gather(
+            *[xpub_slip10.get_xpub_from_path("m/0h")] * 2, return_exceptions=True
+        )
+        assert all(isinstance(r, PrivateDerivationError) for r in results)
+        with pytest.raises(PrivateDerivationError):
+            async for _ in xpub_slip10.iter_path_template("m/0h"):
+                pass
+        with pytest.raises(ValueError):
+            await xpub_slip10.get_xpub_from_path("m/a")
+
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import ecdsa
+import pytest
+
+from slip10 import SLIP10
+from slip10.backends import available_backends, load_backend, set_backend
+from slip10.utils import SECP256K1, SECP256R1
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_backend_selection(backend):
+    assert "ecdsa" in available_backends("secp256k1")
+    assert available_backends("secp256r1")[-1] == "ecdsa"
+    assert available_backends("ed25519") == []
+    assert SECP256K1.backend.name == backend or backend not in available_backends(
+        "secp256k1"
+    )
+
+    with pytest.raises(ValueError):
+        load_backend("secp256k1", "unknown")
+    with pytest.raises(ValueError):
+        load_backend("ed25519")
+    with pytest.raises(ValueError):
+        set_backend("ed25519", "ecdsa")
+
+    # A backend instance can be plugged directly
+    ecdsa_backend = load_backend("secp256k1", "ecdsa")
+    set_backend("secp256k1", ecdsa_backend)
+    assert SECP256K1.backend is ecdsa_backend
+
+
+def test_backend_operations():
+    assert SECP256K1.order == ecdsa.SECP256k1.order
+    assert SECP256R1.order == ecdsa.NIST256p.order
+    for curve in (SECP256K1, SECP256R1):
+        slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name=curve.name)
+        backend = curve.backend
+        privkey, pubkey = slip10.privkey, slip10.pubkey
+        assert backend.privkey_to_pubkey(privkey) == pubkey
+        assert backend.pubkey_is_valid(pubkey)
+        assert not backend.pubkey_is_valid(b"\x02" + b"\xff" * 32)
+        point = backend.pubkey_to_point(pubkey)
+        assert backend.point_to_pubkey(point) == pubkey
+
+        # P + (n - k) * G == k * G + (n - k) * G == infinity
+        tweak = curve.order - int.from_bytes(privkey, "big")
+        assert backend.point_add_tweak(point, tweak) is None
+        tweak = int.from_bytes(privkey, "big")
+        double = 2 * tweak % curve.order
+        double = backend.privkey_to_pubkey(double.to_bytes(32, "big"))
+        assert backend.point_to_pubkey(backend.point_add_tweak(point, tweak)) == double
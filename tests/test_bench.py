@@ -0,0 +1,39 @@
+import json
+
+from slip10 import bench
+
+
+def test_bench(tmp_path, capsys):
+    path = tmp_path / "bench.json"
+    args = ["--samples", "3", "--warmup", "1", "--curve", "secp256k1"]
+    args += ["--curve", "ed25519", "--operation", "from_seed"]
+    args += ["--operation", "public", "--json", str(path)]
+    bench.main(args)
+    results = json.loads(path.read_text())["results"]
+    assert {(r["curve"], r["operation"]) for r in results} == {
+        ("secp256k1", "from_seed"),
+        ("secp256k1", "public"),
+        ("ed25519", "from_seed"),
+    }
+    for result in results:
+        assert result["samples"] == 3
+        assert result["min"] <= result["p50"] <= result["p90"] <= result["max"]
+
+    capsys.readouterr()
+    bench.main(args[:6] + ["--operation", "from_seed", "--compare", str(path)])
+    output = capsys.readouterr().out
+    assert "vs baseline" in output
+    assert len(output.splitlines()) == 1 + len(
+        [
+            r
+            for r in results
+            if r["curve"] == "secp256k1" and r["operation"] == "from_seed"
+        ]
+    )
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert bench._percentile(samples, 50) == 50
+    assert bench._percentile(samples, 99) == 99
+    assert bench._percentile([1], 90) == 1
@@ -0,0 +1,248 @@
+import os
+
+import pytest
+
+from slip10 import (
+    HARDENED_INDEX,
+    SLIP10,
+    DerivationCache,
+    ExtendedKeyCache,
+    InvalidInputError,
+    PersistentDerivationCache,
+    SLIP10Node,
+    stats,
+)
+from slip10.slip10 import ParsingError
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_cache_bounds():
+    with pytest.raises(ValueError):
+        DerivationCache(max_nodes=0)
+    with pytest.raises(ValueError):
+        DerivationCache(max_bytes=0)
+
+    cache = DerivationCache(max_nodes=2)
+    cache.insert("root", [1], bytes(32), None, bytes(33))
+    cache.insert("root", [1, 2], bytes(32), None, bytes(33))
+    assert cache.lookup("root", [1, 2, 3]) == (2, (bytes(32), None, bytes(33)))
+    # [1] is now the least recently used node
+    cache.insert("root", [4], bytes(32), None, bytes(33))
+    assert len(cache) == 2
+    assert cache.lookup("root", [1]) == (0, None)
+    assert cache.lookup("root", [1, 2])[0] == 2
+    assert cache.lookup("root", [4])[0] == 1
+    assert cache.lookup("other root", [4]) == (0, None)
+
+    # Only look for nodes with the requested kind of key
+    assert cache.lookup("root", [4], private=True) == (0, None)
+    cache.insert("root", [4], bytes(32), bytes(32), None)
+    assert cache.lookup("root", [4], private=True) == (
+        1,
+        (bytes(32), bytes(32), bytes(33)),
+    )
+
+    cache = DerivationCache(max_bytes=500)
+    for i in range(10):
+        cache.insert("root", [i], bytes(32), None, bytes(33))
+    assert 0 < len(cache) < 10
+    assert cache.size <= 500
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+    assert cache.lookup("root", [9]) == (0, None)
+
+
+def test_cached_derivation():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpub = slip10.get_xpub_from_path("m/0h")
+    paths = [
+        [HARDENED_INDEX, 1],
+        [HARDENED_INDEX, 1, 2],
+        [HARDENED_INDEX, 1, HARDENED_INDEX + 2, 2],
+        [HARDENED_INDEX, 1, HARDENED_INDEX + 2, 2, 1000000000],
+        [HARDENED_INDEX, 2, 3],
+        [1, 2, 3],
+        [1, 2],
+    ]
+
+    for max_nodes in (1, 3, 100):
+        cache = DerivationCache(max_nodes=max_nodes)
+        cached = SLIP10.from_seed(bytes.fromhex(SEED_1), cache=cache)
+        for _ in range(2):
+            for path in paths:
+                assert cached.get_extended_pubkey_from_path(
+                    path
+                ) == slip10.get_extended_pubkey_from_path(path)
+                assert cached.get_extended_privkey_from_path(
+                    path
+                ) == slip10.get_extended_privkey_from_path(path)
+                assert cached.get_xpriv_from_path(path) == slip10.get_xpriv_from_path(
+                    path
+                )
+                child = cached.get_child_from_path(path)
+                assert child.get_xpub() == slip10.get_xpub_from_path(path)
+                assert child.cache is cache
+        assert 0 < len(cache) <= max_nodes
+
+        # Public-only derivation sharing the same cache
+        pub_cached = SLIP10.from_xpub(xpub, cache=cache)
+        pub_slip10 = SLIP10.from_xpub(xpub)
+        for _ in range(2):
+            for path in ([1], [1, 2], [1, 2, 3], [2]):
+                assert pub_cached.get_xpub_from_path(
+                    path
+                ) == pub_slip10.get_xpub_from_path(path)
+                assert pub_cached.get_child_from_path(path).privkey is None
+
+
+def test_extended_key_cache():
+    with pytest.raises(ValueError):
+        ExtendedKeyCache(max_entries=0)
+    with pytest.raises(ValueError):
+        ExtendedKeyCache(max_bytes=0)
+
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpubs = [slip10.get_xpub_from_path([i]) for i in range(3)]
+    cache = ExtendedKeyCache(max_entries=2)
+    node = SLIP10Node.from_xpub(xpubs[0], cache=cache)
+    assert SLIP10Node.from_xpub(xpubs[0], cache=cache) is node
+    assert SLIP10Node.from_xpub(xpubs[0], "structural", cache=cache) is node
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+    # Trailing whitespace is ignored, and not part of the node's xpub.
+    assert SLIP10Node.from_xpub(xpubs[0] + "\n", cache=cache) is node
+    assert SLIP10Node.from_xpub(xpubs[0] + " \n").get_xpub() == xpubs[0]
+    # A node which was not fully validated isn't returned for a full validation.
+    trusted = SLIP10Node.from_xpub(xpubs[1], "trusted", cache=cache)
+    assert SLIP10Node.from_xpub(xpubs[1], "trusted", cache=cache) is trusted
+    full = SLIP10Node.from_xpub(xpubs[1], cache=cache)
+    assert full is not trusted and full == trusted
+    assert SLIP10Node.from_xpub(xpubs[1], "trusted", cache=cache) is full
+    assert (cache.hits, cache.misses, len(cache)) == (5, 3, 2)
+    # xpubs[0] is the least recently used one.
+    SLIP10Node.from_xpub(xpubs[2], cache=cache)
+    assert SLIP10Node.from_xpub(xpubs[1], cache=cache) is full
+    assert SLIP10Node.from_xpub(xpubs[0], cache=cache) is not node
+    with pytest.raises(InvalidInputError):
+        SLIP10Node.from_xpub(xpubs[0], "none", cache=cache)
+
+    # xprivs are only cached if enabled.
+    xpriv = slip10.get_xpriv()
+    assert SLIP10Node.from_xpriv(xpriv, cache=cache) is not SLIP10Node.from_xpriv(
+        xpriv, cache=cache
+    )
+    assert xpriv not in cache._entries
+    cache = ExtendedKeyCache(xprivs=True)
+    node = SLIP10Node.from_xpriv(xpriv, cache=cache)
+    assert SLIP10Node.from_xpriv(xpriv, cache=cache) is node
+    assert node.privkey == slip10.privkey
+    # A cached key is not returned for the other kind of extended key.
+    SLIP10Node.from_xpub(xpubs[1], cache=cache)
+    with pytest.raises(ParsingError):
+        SLIP10Node.from_xpriv(xpubs[1], cache=cache)
+    with pytest.raises(ParsingError):
+        SLIP10Node.from_xpub(xpriv, cache=cache)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache), cache.size) == (0, 0, 0, 0)
+    cache = ExtendedKeyCache(max_bytes=1000)
+    for xpub in xpubs:
+        SLIP10Node.from_xpub(xpub, cache=cache)
+    assert len(cache) == 1 and 0 < cache.size <= 1000
+
+
+def test_persistent_derivation_cache(tmp_path):
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    account = SLIP10.from_xpub(slip10.get_xpub_from_path("m/44h/0h/0h"))
+    paths = [[0, i] for i in range(20)] + [[1, 0], [1, 0, 7]]
+    expected = [account.get_extended_pubkey_from_path(p) for p in paths]
+    path = tmp_path / "account.cache"
+
+    with PersistentDerivationCache(path, account, capacity=100) as cache:
+        assert cache.capacity == 128 and len(cache) == 0
+        cached = SLIP10.from_xpub(account.get_xpub(), cache=cache)
+        assert [cached.get_extended_pubkey_from_path(p) for p in paths] == expected
+        assert len(cache) == 24
+        # Private derivations, and other parents, don't use the file.
+        assert cache.lookup(
+            ("secp256k1", account.chaincode, account.pubkey), [0, 1], private=True
+        ) == (0, None)
+        other = SLIP10.from_xpub(slip10.get_xpub_from_path([0]), cache=cache)
+        other.get_xpub_from_path([0, 1])
+        slip10.get_xpub_from_path([0, 1])
+        assert len(cache) == 24
+
+        # Records are keyed by their full parent pubkey: a record whose parent
+        # does not match is not used.
+        root = ("secp256k1", account.chaincode, account.pubkey)
+        offset = cache._find(account.get_pubkey_from_path([0]), 3)
+        cache._map[offset + 32] ^= 1
+        assert cache.lookup(root, [0, 3])[0] == 1
+        cache._map[offset + 32] ^= 1
+        assert cache.lookup(root, [0, 3])[0] == 2
+
+        # A torn record fails its checksum, and is written again once derived.
+        cache._map[offset + 40] ^= 1
+        assert cache.lookup(root, [0, 3])[0] == 1
+        assert cached.get_xpub_from_path([0, 3]) == account.get_xpub_from_path([0, 3])
+        assert cache.lookup(root, [0, 3]) == (2, (expected[3][0], None, expected[3][1]))
+        assert len(cache) == 24
+
+        # The children derived in bulk are read from the file, and added to
+        # it.
+        children = account.derive_children([0], range(25))
+        assert cached.derive_children([0], range(25)) == children
+        assert len(cache) == 29
+        stats(reset=True)
+        assert cached.derive_children([0], range(25)) == children
+        assert [(c, p) for _, p, c in cached.iter_children([0], 0, 25)] == children
+        assert stats()["hmac_sha512"] == 0
+
+    # A parent holding a private key uses the file as well.
+    account = slip10.get_child_from_path("m/44h/0h/0h")
+    with PersistentDerivationCache(path, account) as cache:
+        cached = SLIP10.from_xpriv(account.get_xpriv(), cache=cache)
+        assert cached.get_extended_pubkey_from_path([1, 1]) == (
+            account.get_extended_pubkey_from_path([1, 1])
+        )
+        assert cached.derive_children([1], range(3)) == (
+            account.derive_children([1], range(3))
+        )
+        assert len(cache) == 31
+        assert cache.lookup(root, [1, 2])[0] == 2
+
+    # The file is reused, read-only, and fills up to its maximum load.
+    size = os.path.getsize(path)
+    with PersistentDerivationCache(path, account, readonly=True) as cache:
+        assert cache.lookup(
+            ("secp256k1", account.chaincode, account.pubkey), [1, 0, 7, 1]
+        ) == (3, (expected[-1][0], None, expected[-1][1]))
+        cached = SLIP10.from_xpub(account.get_xpub(), cache=cache)
+        child = cached.get_child_from_path([0, 3])
+        assert child.get_xpub() == account.get_xpub_from_path([0, 3])
+        cached.get_xpub_from_path([2, 0])
+        assert len(cache) == 31
+    with PersistentDerivationCache(path, account, capacity=4) as cache:
+        assert cache.capacity == 128
+        cached = SLIP10.from_xpub(account.get_xpub(), cache=cache)
+        for i in range(200):
+            assert cached.get_extended_pubkey_from_path(
+                [2, i]
+            ) == account.get_extended_pubkey_from_path([2, i])
+        assert len(cache) == 96
+    assert os.path.getsize(path) == size
+
+    # A file for another parent, or not a cache file, is rejected.
+    with pytest.raises(ValueError, match="another parent"):
+        PersistentDerivationCache(path, slip10)
+    path.write_bytes(b"not a cache" * 10)
+    with pytest.raises(ValueError, match="Not a derivation cache"):
+        PersistentDerivationCache(path, account)
+    with pytest.raises(ValueError):
+        PersistentDerivationCache(
+            tmp_path / "ed25519", SLIP10.from_seed(bytes(16), curve_name="ed25519")
+        )
+    with pytest.raises(ValueError):
+        PersistentDerivationCache(tmp_path / "empty", account, capacity=0)
@@ -0,0 +1,53 @@
+import pytest
+
+import slip10
+from slip10 import SLIP10, DerivationCache
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+@pytest.fixture(autouse=True)
+def counters():
+    slip10.reset_stats()
+    yield
+    slip10.enable_stats()
+
+
+def test_counters():
+    master = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    assert slip10.stats(reset=True) == {
+        "hmac_sha512": 1,
+        "scalar_multiplications": 1,
+        "point_decompressions": 0,
+        "fingerprints": 0,
+        "retries": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+    assert slip10.stats()["hmac_sha512"] == 0
+
+    xpub = master.get_xpub_from_path("m/0h")
+    stats = slip10.stats(reset=True)
+    # The master pubkey is known, only the child's one is computed.
+    assert stats["hmac_sha512"] == stats["scalar_multiplications"] == 1
+    assert stats["fingerprints"] == 1
+
+    account = SLIP10.from_xpub(xpub, cache=DerivationCache())
+    account.get_pubkey_from_path("m/1/2")
+    stats = slip10.stats(reset=True)
+    # Once to validate the pubkey, and once to derive from it.
+    assert stats["point_decompressions"] == 2
+    assert stats["hmac_sha512"] == stats["scalar_multiplications"] == 2
+    assert (stats["cache_hits"], stats["cache_misses"]) == (0, 1)
+    account.get_pubkey_from_path("m/1/3")
+    stats = slip10.stats()
+    assert stats["hmac_sha512"] == 1
+    assert (stats["cache_hits"], stats["cache_misses"]) == (1, 0)
+
+    slip10.reset_stats()
+    slip10.enable_stats(False)
+    SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name="ed25519")
+    assert not any(slip10.stats().values())
+    slip10.enable_stats()
+    SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name="ed25519")
+    assert slip10.stats()["hmac_sha512"] == 1
@@ -0,0 +1,52 @@
+import os
+
+import base58
+import pytest
+
+from slip10 import SLIP10, PrivateDerivationError, SLIP10Node, encode_extended_keys
+from slip10.slip10 import SerializationError
+from slip10.utils import _b58decode_check, _b58encode_check
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_b58encode_check():
+    for data in (
+        bytes(78),
+        b"\x00\x00" + os.urandom(76),
+        os.urandom(78),
+        os.urandom(5),
+        b"\x00",
+        b"",
+    ):
+        assert _b58encode_check(data) == base58.b58encode_check(data).decode()
+        assert _b58decode_check(_b58encode_check(data)) == data
+    with pytest.raises(ValueError, match="Invalid checksum"):
+        _b58decode_check("1111111")
+    with pytest.raises(ValueError, match="Invalid character"):
+        _b58decode_check("xpub0")
+
+
+def test_encode_extended_keys():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    nodes = [slip10] + [
+        slip10.get_child_from_path(path) for path in ("m/0h", "m/0h/1", "m/0h/1/2h")
+    ]
+    nodes.append(SLIP10Node.from_slip10(nodes[-1]).get_child(2))
+    assert encode_extended_keys(nodes) == [node.get_xpub() for node in nodes]
+    assert encode_extended_keys(iter(nodes), private=True) == [
+        node.get_xpriv() for node in nodes
+    ]
+    assert encode_extended_keys(nodes)[-1] == (
+        "xpub6FHa3pjLCk84BayeJxFW2SP4XRrFd1JYnxeLeU8EqN3vDfZmbqBqaGJAyiLjTAwm6ZLRQUMv1ZACTj37sR62cfN7fe5JnJ7dh8zL4fiyLHV"
+    )
+    testnet = SLIP10.from_seed(bytes.fromhex(SEED_1), network="test")
+    assert encode_extended_keys([testnet]) == [testnet.get_xpub()]
+    assert encode_extended_keys([]) == []
+
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub())
+    with pytest.raises(PrivateDerivationError):
+        encode_extended_keys([slip10, xpub_slip10], private=True)
+    ed25519 = SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name="ed25519")
+    with pytest.raises(SerializationError):
+        encode_extended_keys([ed25519])
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from slip10 import bench
+
+# Packages which are slow to import, and only needed once a curve is used.
+SLOW_MODULES = (
+    "ecdsa",
+    "cryptography",
+    "coincurve",
+    "base58",
+    "importlib.metadata",
+    "concurrent.futures.process",
+)
+
+
+def _imported_modules(code):
+    code += "\nimport sys\nprint(' '.join(sys.modules))"
+    return subprocess.check_output([sys.executable, "-c", code]).decode().split()
+
+
+def test_lazy_imports():
+    modules = _imported_modules("import slip10")
+    for module in SLOW_MODULES:
+        assert module not in modules
+
+    modules = _imported_modules(
+        "import slip10\nslip10.SLIP10.from_seed(bytes(32), curve_name='ed25519')"
+    )
+    assert "cryptography" in modules
+    assert "ecdsa" not in modules
+
+    modules = _imported_modules(
+        "import slip10\nassert slip10.__version__\nassert slip10.derive_many"
+    )
+    assert "importlib.metadata" in modules
+    assert "ecdsa" not in modules
+
+
+def test_import_benchmark():
+    result = bench.measure_import(2)
+    assert result["samples"] == 2
+    assert 0 < result["min"] <= result["max"]
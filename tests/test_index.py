@@ -0,0 +1,52 @@
+import pytest
+
+from slip10 import SLIP10, DerivationPath, InvalidInputError, ReverseIndex
+from slip10.index import INITIAL_SLOTS
+from slip10.utils import _hash160
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_reverse_index():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    account = SLIP10.from_xpub(slip10.get_xpub_from_path("m/84h/0h/0h"))
+
+    index = ReverseIndex(account, gap_limit=5)
+    assert len(index) == 10 and index.size(0) == index.size(1) == 5
+    pubkey = account.get_pubkey_from_path([1, 4])
+    assert pubkey in index and _hash160(pubkey) in index
+    assert index.lookup(pubkey) == DerivationPath([1, 4])
+    # Finding a key extends its chain up to the gap limit.
+    assert index.size(1) == 10 and index.size(0) == 5
+    assert index.lookup(
+        _hash160(account.get_pubkey_from_path([1, 9]))
+    ) == DerivationPath([1, 9])
+    assert index.size(1) == 15
+    assert index.lookup(account.get_pubkey_from_path([0, 5])) is None
+    assert index.lookup(slip10.get_pubkey_from_path([0])) is None
+    assert bytes(20) not in index
+
+    # The table grows as the index is extended, and an account with private
+    # keys can be indexed too.
+    index = ReverseIndex(
+        slip10.get_child_from_path("m/84h/0h/0h"), chains=[7], gap_limit=0
+    )
+    assert len(index) == 0 and index.lookup(pubkey) is None
+    assert index.extend(7, INITIAL_SLOTS) == INITIAL_SLOTS
+    assert index.extend(7, 10) == 0
+    assert len(index._slots) > INITIAL_SLOTS
+    for i in (0, 511, INITIAL_SLOTS - 1):
+        assert index.lookup(account.get_pubkey_from_path([7, i])) == DerivationPath(
+            [7, i]
+        )
+
+    with pytest.raises(InvalidInputError):
+        index.lookup(bytes(32))
+    with pytest.raises(ValueError):
+        index.extend(0, 10)
+    with pytest.raises(ValueError):
+        ReverseIndex(account, chains=())
+    with pytest.raises(ValueError):
+        ReverseIndex(account, chains=[0x80000000])
+    with pytest.raises(ValueError):
+        ReverseIndex(account, gap_limit=-1)
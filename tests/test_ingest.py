@@ -0,0 +1,73 @@
+import pytest
+
+from slip10 import SLIP10, iter_extended_keys, load_extended_keys
+from slip10.utils import _b58encode_check
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def _lines():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpub = slip10.get_xpub_from_path("m/0h/1")
+    xpriv = slip10.get_xpriv_from_path("m/0h/1/2h")
+    off_curve = next(
+        pubkey
+        for pubkey in (b"\x02" + x.to_bytes(32, "big") for x in range(1, 100))
+        if not slip10.curve.pubkey_is_valid(pubkey)
+    )
+    # Some are from the invalid extended keys test vectors of BIP-0032.
+    return [
+        xpub,
+        "",
+        xpriv,
+        xpub[:-1] + ("1" if xpub[-1] != "1" else "2"),
+        _b58encode_check(slip10.get_xpub_bytes()[:-33] + off_curve),
+        "DMwo58pR1QLEFihHiXPVykYB6fJmsTeHvyTp7hRThAtCX8CvYzgPcn8XnmdfHPmHJiEDXkTiJTVV9rHEBUem2mwVbbNfvT2MTcAqj3nesx8uBf9",
+        _b58encode_check(slip10.get_xpub_bytes()[:-1]),
+        " " + xpub + " ",
+        "xpubé",
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_extended_keys(workers):
+    lines = _lines()
+    nodes, errors = load_extended_keys(lines, workers=workers, chunksize=2)
+    assert [line_number for line_number, _ in nodes] == [1, 3, 8]
+    assert [node.get_xpub() for _, node in nodes] == [
+        lines[0],
+        nodes[1][1].get_xpub(),
+        lines[0],
+    ]
+    assert nodes[1][1].get_xpriv() == lines[2]
+    assert nodes[1][1].privkey is not None
+    assert errors == [
+        (4, "Invalid checksum"),
+        (5, "Invalid public key"),
+        (6, "Unknown version prefix"),
+        (7, "Invalid length"),
+        (9, "Invalid character"),
+    ]
+
+    nodes, errors = load_extended_keys(lines, "structural", workers=workers)
+    assert [line_number for line_number, _ in nodes] == [1, 3, 5, 8]
+
+
+def test_load_extended_keys_from_file(tmp_path):
+    lines = _lines()
+    path = tmp_path / "xpubs.txt"
+    path.write_text("\n".join(lines), encoding="utf-8")
+    assert load_extended_keys(path, workers=1) == load_extended_keys(lines, workers=1)
+    assert load_extended_keys(str(path), workers=2) == load_extended_keys(
+        lines, workers=1
+    )
+    path.write_bytes(b"")
+    assert load_extended_keys(path) == ([], [])
+    results = iter_extended_keys(iter(lines), workers=1)
+    assert next(results)[:2] == (1, load_extended_keys(lines[:1])[0][0][1])
+
+
+def test_iter_extended_keys_args():
+    for kwargs in ({"validation": "none"}, {"workers": 0}, {"chunksize": 0}):
+        with pytest.raises(ValueError):
+            iter_extended_keys([], **kwargs)
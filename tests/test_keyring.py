@@ -0,0 +1,95 @@
+import pytest
+
+from slip10 import (
+    SLIP10,
+    DerivationCache,
+    InvalidInputError,
+    Keyring,
+    PrivateDerivationError,
+    SLIP10Node,
+)
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+SEED_2 = "fffcf9f6f3f0edeae7e4e1dedbd8d5d2cfccc9c6c3c0bdbab7b4b1aeaba8a5a29f9c999693908d8a8784817e7b7875726f6c696663605d5a5754514e4b484542"
+
+
+def test_keyring():
+    masters = [SLIP10.from_seed(bytes.fromhex(seed)) for seed in (SEED_1, SEED_2)]
+    keyring = Keyring(DerivationCache(max_nodes=100))
+    fingerprints = [keyring.add(master) for master in masters]
+    assert fingerprints == [bytes.fromhex("3442193e"), bytes.fromhex("bd16bee5")]
+    assert len(keyring) == 2 and fingerprints[0] in keyring
+
+    for master, fingerprint in zip(masters, fingerprints):
+        child = keyring.get_child_from_path(fingerprint, "m/84h/0h/0h/0/1")
+        assert child.get_xpriv() == master.get_xpriv_from_path("m/84h/0h/0h/0/1")
+        assert child.cache is keyring.cache
+        assert keyring.get_privkey_from_path(
+            fingerprint, [0], master.get_pubkey_from_path([0])
+        ) == master.get_privkey_from_path([0])
+    assert len(keyring.cache) > 0
+    # The nodes which were added are left untouched.
+    assert masters[0].cache is None
+
+    # An account xpub resolves the paths from its master.
+    account = SLIP10Node.from_xpub(masters[0].get_xpub_from_path("m/84h/0h/1h"))
+    accounts = Keyring()
+    with pytest.raises(InvalidInputError):
+        accounts.add(account)
+    with pytest.raises(InvalidInputError):
+        accounts.add(account, (fingerprints[0], "m/84h/0h"))
+    assert accounts.add(account, (fingerprints[0], "m/84h/0h/1h")) == fingerprints[0]
+    child = accounts.get_child_from_path(fingerprints[0], "m/84h/0h/1h/1/5")
+    assert child.get_xpub() == masters[0].get_xpub_from_path("m/84h/0h/1h/1/5")
+    with pytest.raises(PrivateDerivationError):
+        accounts.get_privkey_from_path(fingerprints[0], "m/84h/0h/1h/1/5")
+    with pytest.raises(InvalidInputError):
+        accounts.get_child_from_path(fingerprints[0], "m/84h/0h/2h/1/5")
+
+    # Colliding fingerprints are told apart by the pubkey.
+    keyring.add(account, (fingerprints[1], "m/84h/0h/1h"))
+    pubkey = masters[1].get_pubkey_from_path("m/84h/0h/1h/0/0")
+    with pytest.raises(InvalidInputError):
+        keyring.get_child_from_path(fingerprints[1], "m/84h/0h/1h/0/0")
+    assert (
+        keyring.get_child_from_path(fingerprints[1], "m/84h/0h/1h/0/0", pubkey).pubkey
+        == pubkey
+    )
+    with pytest.raises(InvalidInputError):
+        keyring.get_child_from_path(fingerprints[1], "m/84h/0h/1h/0/0", bytes(33))
+
+    # A node which can't derive a hardened path does not hide one which can.
+    colliding = Keyring()
+    colliding.add(account, (fingerprints[1], "m/84h/0h/1h"))
+    with pytest.raises(PrivateDerivationError):
+        colliding.get_child_from_path(fingerprints[1], "m/84h/0h/1h/0h")
+    colliding.add(masters[1])
+    path = "m/84h/0h/1h/0h"
+    expected = masters[1].get_child_from_path(path)
+    assert colliding.get_child_from_path(fingerprints[1], path).pubkey == (
+        expected.pubkey
+    )
+    assert (
+        colliding.get_privkey_from_path(fingerprints[1], path, expected.pubkey)
+        == expected.privkey
+    )
+
+    # A master xpriv and its account xpub derive the same keys.
+    wallet = Keyring()
+    wallet.add(account, (fingerprints[0], "m/84h/0h/1h"))
+    wallet.add(masters[0])
+    path = "m/84h/0h/1h/0/1"
+    expected = masters[0].get_child_from_path(path)
+    assert wallet.get_child_from_path(fingerprints[0], path).privkey == (
+        expected.privkey
+    )
+    assert (
+        wallet.get_privkey_from_path(fingerprints[0], path, expected.pubkey)
+        == expected.privkey
+    )
+
+    with pytest.raises(InvalidInputError):
+        keyring.get_child_from_path(bytes(4), "m/0")
+    assert keyring.remove(fingerprints[1]) == 2
+    assert keyring.remove(fingerprints[1]) == 0
+    assert len(keyring) == 1 and fingerprints[1] not in keyring
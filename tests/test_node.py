@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from slip10 import HARDENED_INDEX, SLIP10, PrivateDerivationError, SLIP10Node
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_node():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    node = SLIP10Node.from_slip10(slip10)
+    assert node.get_xpub() == slip10.get_xpub()
+    assert node.get_xpub_bytes() == slip10.get_xpub_bytes()
+    assert node.get_xpriv() == slip10.get_xpriv()
+    assert node.get_xpriv_bytes() == slip10.get_xpriv_bytes()
+    # Memoized
+    assert node.get_xpub() is node.get_xpub()
+    assert node.fingerprint is node.fingerprint
+    assert node.fingerprint == bytes.fromhex("3442193e")
+
+    # Immutable
+    with pytest.raises(AttributeError):
+        node.pubkey = bytes(33)
+    with pytest.raises(AttributeError):
+        node.other = 1
+    with pytest.raises(AttributeError):
+        del node.index
+    assert not hasattr(node, "__dict__")
+
+    # Hashable
+    assert node == SLIP10Node.from_xpriv(slip10.get_xpriv())
+    assert len({node, SLIP10Node.from_xpriv(slip10.get_xpriv())}) == 1
+    assert node != SLIP10Node.from_xpub(slip10.get_xpub())
+    assert pickle.loads(pickle.dumps(node)) == node
+
+    child = node.get_child(HARDENED_INDEX).get_child(1)
+    assert child.get_xpriv() == slip10.get_xpriv_from_path("m/0h/1")
+    assert child.to_slip10().get_xpub_from_path("m/2h") == slip10.get_xpub_from_path(
+        "m/0h/1/2h"
+    )
+
+    xpub_node = SLIP10Node.from_xpub(slip10.get_xpub_from_path("m/0h"))
+    assert xpub_node.get_child(1).get_xpub() == child.get_xpub()
+    with pytest.raises(PrivateDerivationError):
+        xpub_node.get_child(HARDENED_INDEX)
+    with pytest.raises(PrivateDerivationError):
+        xpub_node.get_xpriv()
+
+    assert SLIP10Node(slip10.chaincode, slip10.privkey) == node
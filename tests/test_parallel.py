@@ -0,0 +1,28 @@
+import pytest
+
+from slip10 import HARDENED_INDEX, SLIP10, PrivateDerivationError, derive_many
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_derive_many():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    paths = ["m/0h/1", [HARDENED_INDEX, 1, 2], 3, [], "m/4/5"] + list(range(20))
+    expected = [
+        slip10.get_extended_pubkey_from_path([p] if isinstance(p, int) else p)
+        for p in paths
+    ]
+    assert list(derive_many(slip10, paths, workers=2, chunksize=3)) == expected
+    assert list(derive_many(slip10, iter(paths), workers=1)) == expected
+
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub())
+    assert list(derive_many(xpub_slip10, range(20), workers=2, chunksize=7)) == (
+        expected[5:]
+    )
+    with pytest.raises(PrivateDerivationError):
+        list(derive_many(xpub_slip10, ["m/0h"], workers=1))
+
+    with pytest.raises(ValueError):
+        derive_many(slip10, paths, workers=0)
+    with pytest.raises(ValueError):
+        derive_many(slip10, paths, chunksize=0)
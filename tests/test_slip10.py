@@ -3,7 +3,13 @@ import os
 import ecdsa
 import pytest
 
-from slip10 import HARDENED_INDEX, SLIP10, InvalidInputError, PrivateDerivationError
+from slip10 import (
+    HARDENED_INDEX,
+    SLIP10,
+    DerivationPath,
+    InvalidInputError,
+    PrivateDerivationError,
+)
 
 SEED_1 = "000102030405060708090a0b0c0d0e0f"
 SEED_2 = "fffcf9f6f3f0edeae7e4e1dedbd8d5d2cfccc9c6c3c0bdbab7b4b1aeaba8a5a29f9c999693908d8a8784817e7b7875726f6c696663605d5a5754514e4b484542"
@@ -914,3 +920,233 @@ def test_slip10_vectors():
             assert node.chaincode.hex() == chaincode
             assert node.privkey.hex() == privkey
             assert node.pubkey.hex() == pubkey
+
+
+def test_derive_children():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    indices = [0, 1, 2, 1000000000]
+    children = slip10.derive_children("m/0h/1", indices)
+    assert children == [
+        slip10.get_extended_pubkey_from_path([HARDENED_INDEX, 1, i]) for i in indices
+    ]
+    h_indices = [HARDENED_INDEX, HARDENED_INDEX + 2]
+    assert slip10.derive_children([HARDENED_INDEX, 1], h_indices) == [
+        slip10.get_extended_pubkey_from_path([HARDENED_INDEX, 1, i]) for i in h_indices
+    ]
+    assert slip10.derive_children("m", []) == []
+
+    # Pubkey-only derivation
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub_from_path("m/0h"))
+    assert xpub_slip10.derive_children("m/1", indices) == children
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.derive_children("m/1", [HARDENED_INDEX])
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.derive_children("m/1h", [0])
+
+    for curve_name in ("secp256r1", "ed25519", "curve25519"):
+        slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name=curve_name)
+        indices = [HARDENED_INDEX, HARDENED_INDEX + 1]
+        assert slip10.derive_children("m/0h", indices) == [
+            slip10.get_extended_pubkey_from_path([HARDENED_INDEX, i]) for i in indices
+        ]
+
+
+def test_public_derivation_from_point():
+    for curve_name in ("secp256k1", "secp256r1"):
+        slip10 = SLIP10.from_seed(bytes.fromhex(SEED_2), curve_name=curve_name)
+        curve = slip10.curve
+        pubkey, chaincode = slip10.pubkey, slip10.chaincode
+        point = curve.pubkey_to_point(pubkey)
+        for index in (0, 1, 2147483647, 42):
+            expected = curve.derive_public_child(pubkey, chaincode, index)
+            point, pubkey, chaincode = curve.derive_public_child_from_point(
+                point, pubkey, chaincode, index
+            )
+            assert (pubkey, chaincode) == expected
+            assert curve.point_to_pubkey(point) == pubkey
+
+
+def test_iter_children():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    children = slip10.iter_children("m/0h/1", start=5)
+    for index, (child_index, pubkey, chaincode) in zip(range(5, 10), children):
+        assert child_index == index
+        assert (chaincode, pubkey) == slip10.get_extended_pubkey_from_path(
+            [HARDENED_INDEX, 1, index]
+        )
+    assert next(children)[0] == 10
+    assert list(slip10.iter_children("m", 3, 3)) == []
+    assert [c[0] for c in slip10.iter_children("m", HARDENED_INDEX - 1)] == [
+        HARDENED_INDEX - 1
+    ]
+    children = slip10.iter_children([HARDENED_INDEX], 2 * HARDENED_INDEX - 2)
+    assert [(c[2], c[1]) for c in children] == slip10.derive_children(
+        [HARDENED_INDEX], [2 * HARDENED_INDEX - 2, 2 * HARDENED_INDEX - 1]
+    )
+
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub_from_path("m/0h"))
+    assert [c[0] for c in xpub_slip10.iter_children("m/1", 0, 3)] == [0, 1, 2]
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.iter_children("m/1", HARDENED_INDEX)
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.iter_children("m/1", HARDENED_INDEX - 1, HARDENED_INDEX + 1)
+    with pytest.raises(InvalidInputError):
+        slip10.iter_children("m", 2, 1)
+    with pytest.raises(InvalidInputError):
+        slip10.iter_children("m", -1)
+
+
+def test_iter_path_template(monkeypatch):
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    children = list(slip10.iter_path_template("m/44'/{0-1}'/{0,2}/{5}/{1-2,7}"))
+    assert [str(path) for path, _, _ in children[:4]] == [
+        "m/44h/0h/0/5/1",
+        "m/44h/0h/0/5/2",
+        "m/44h/0h/0/5/7",
+        "m/44h/0h/2/5/1",
+    ]
+    assert len(children) == 2 * 2 * 3
+    for path, pubkey, chaincode in children:
+        assert (chaincode, pubkey) == slip10.get_extended_pubkey_from_path(path)
+    templates = ("m/{0,1}/{3-4}h/{2}", [range(3), 1, (HARDENED_INDEX, 2)], "m", "m/3")
+    for template in templates:
+        for path, pubkey, chaincode in slip10.iter_path_template(template):
+            assert (chaincode, pubkey) == slip10.get_extended_pubkey_from_path(path)
+    assert list(slip10.iter_path_template([range(0)])) == []
+
+    # Each intermediate node is derived once.
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub_from_path("m/0h"))
+    steps = []
+    derive = xpub_slip10.curve.derive_public_child_from_point
+    monkeypatch.setattr(
+        xpub_slip10.curve,
+        "derive_public_child_from_point",
+        lambda *args: steps.append(args) or derive(*args),
+    )
+    children = xpub_slip10.iter_path_template("m/1/{0,1}/{0-9}")
+    assert len(list(children)) == 20
+    assert len(steps) == 1 + 2 + 20
+
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.iter_path_template("m/1/{0-1}h")
+    for template in ("m/{1-0}", "m/{0-2147483648}", "m/{}", "m/{0-1", "m/0/{a}"):
+        with pytest.raises(InvalidInputError):
+            slip10.iter_path_template(template)
+    with pytest.raises(InvalidInputError):
+        slip10.iter_path_template([range(-1, 1)])
+
+
+def test_single_pass_derivation(monkeypatch):
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub())
+    steps = []
+    for method in ("derive_private_child", "derive_public_child_from_point"):
+        derive = getattr(slip10.curve, method)
+        monkeypatch.setattr(
+            slip10.curve,
+            method,
+            lambda *args, derive=derive: steps.append(args) or derive(*args),
+        )
+
+    path = [HARDENED_INDEX, 1, HARDENED_INDEX + 2, 2]
+    slip10.get_xpub_from_path(path)
+    assert len(steps) == len(path)
+    steps.clear()
+    slip10.get_xpriv_from_path(path)
+    assert len(steps) == len(path)
+    steps.clear()
+    slip10.get_child_from_path(path)
+    assert len(steps) == len(path)
+    steps.clear()
+    xpub_slip10.get_xpub_from_path([1, 2, 3])
+    assert len(steps) == 3
+
+
+def test_validation_levels():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpub = slip10.get_xpub_from_path("m/0h/1")
+    xpriv = slip10.get_xpriv_from_path("m/0h/1")
+    for validation in ("full", "structural", "trusted"):
+        assert SLIP10.from_xpub(xpub, validation=validation).get_xpub() == xpub
+        assert SLIP10.from_xpriv(xpriv, validation=validation).get_xpub() == xpub
+    with pytest.raises(InvalidInputError, match="'validation' must be one of"):
+        SLIP10(slip10.chaincode, slip10.privkey, validation="none")
+
+    # A public key which is not on the curve
+    not_on_curve = b"\x02" + b"\xff" * 32
+    with pytest.raises(InvalidInputError, match="Invalid public key"):
+        SLIP10(slip10.chaincode, pubkey=not_on_curve)
+    SLIP10(slip10.chaincode, pubkey=not_on_curve, validation="structural")
+    # A badly encoded public key
+    for validation in ("full", "structural"):
+        with pytest.raises(InvalidInputError, match="Invalid public key"):
+            SLIP10(slip10.chaincode, pubkey=b"\x04" + bytes(32), validation=validation)
+        with pytest.raises(InvalidInputError, match="Invalid private key"):
+            SLIP10(slip10.chaincode, bytes(32), validation=validation)
+    # Mismatching keys
+    other_pubkey = slip10.get_pubkey_from_path("m/0")
+    with pytest.raises(InvalidInputError, match="does not match"):
+        SLIP10(slip10.chaincode, slip10.privkey, other_pubkey)
+    SLIP10(slip10.chaincode, slip10.privkey, other_pubkey, validation="structural")
+    SLIP10(slip10.chaincode, bytes(32), not_on_curve, validation="trusted")
+
+    ed25519 = SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name="ed25519")
+    SLIP10(
+        ed25519.chaincode,
+        pubkey=ed25519.pubkey,
+        curve_name="ed25519",
+        validation="structural",
+    )
+    with pytest.raises(InvalidInputError, match="Invalid public key"):
+        SLIP10(
+            ed25519.chaincode,
+            pubkey=b"\x02" + ed25519.pubkey[1:],
+            curve_name="ed25519",
+            validation="structural",
+        )
+
+
+def test_derivation_path():
+    path = DerivationPath.from_str("m/0h/1/2H/2")
+    assert path is DerivationPath.from_str("m/0h/1/2H/2")
+    assert path == DerivationPath([HARDENED_INDEX, 1, HARDENED_INDEX + 2, 2])
+    assert hash(path) == hash(DerivationPath.from_str("m/0'/1/2'/2"))
+    assert list(path) == [HARDENED_INDEX, 1, HARDENED_INDEX + 2, 2]
+    assert len(path) == 4 and path[-1] == 2
+    assert path.hardened == (True, False, True, False)
+    assert path.last_hardened == 2
+    assert path.has_hardened
+    assert path.parent == path[:-1] == DerivationPath.from_str("m/0h/1/2h")
+    assert path.parent is path.parent
+    assert str(path) == "m/0h/1/2h/2"
+    assert DerivationPath([]).parent is None
+    assert not DerivationPath([1, 2]).has_hardened
+    assert DerivationPath([1, 2]).last_hardened == -1
+    with pytest.raises(AttributeError):
+        path.indexes = ()
+    with pytest.raises(ValueError, match="invalid format"):
+        DerivationPath.from_str("m/1/a")
+    with pytest.raises(ValueError, match="invalid index"):
+        DerivationPath([2 * HARDENED_INDEX])
+    with pytest.raises(ValueError, match="invalid index"):
+        DerivationPath([-1])
+
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub_from_path("m/0h"))
+    assert slip10.get_xpub_from_path(path) == slip10.get_xpub_from_path(str(path))
+    assert slip10.get_xpriv_from_path(path) == slip10.get_xpriv_from_path(str(path))
+    assert slip10.get_pubkey_from_path(path) == slip10.get_pubkey_from_path(list(path))
+    assert slip10.get_privkey_from_path(path) == slip10.get_privkey_from_path(
+        list(path)
+    )
+    assert slip10.get_child_from_path(path).get_xpub() == slip10.get_xpub_from_path(
+        path
+    )
+    assert slip10.derive_children(path, [1]) == slip10.derive_children(list(path), [1])
+    path = DerivationPath([1, 2])
+    assert xpub_slip10.get_xpub_from_path(path) == slip10.get_xpub_from_path(
+        [HARDENED_INDEX, 1, 2]
+    )
+    assert next(xpub_slip10.iter_children(path))[0] == 0
+    with pytest.raises(PrivateDerivationError):
+        xpub_slip10.get_xpub_from_path(DerivationPath([HARDENED_INDEX]))
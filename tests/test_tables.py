@@ -0,0 +1,85 @@
+import ecdsa
+import pytest
+
+from slip10 import SLIP10
+from slip10.backends import EcdsaBackend, set_backend
+from slip10.tables import GeneratorTable, table_size
+from slip10.utils import SECP256K1
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_generator_table(tmp_path):
+    for curve_name, curve in (
+        ("secp256k1", ecdsa.SECP256k1),
+        ("secp256r1", ecdsa.NIST256p),
+    ):
+        scalars = [1, 2, 3, 255, 256, 2**255 + 1, curve.order - 1, curve.order + 5]
+        scalars += [int.from_bytes(bytes([i]) * 32, "big") for i in range(1, 256, 37)]
+        expected = [
+            ((curve.generator * k).x(), (curve.generator * k).y()) for k in scalars
+        ]
+        for window in (1, 3, 8):
+            table = GeneratorTable.build(curve_name, window)
+            assert [table.multiply(k) for k in scalars] == expected
+            assert table.multiply(0) is None and table.multiply(curve.order) is None
+
+            path = tmp_path / f"{curve_name}-{window}.table"
+            table.save(path)
+            assert path.stat().st_size == table_size(window)
+            loaded = GeneratorTable.load(path, curve_name)
+            assert loaded.window == window
+            assert [loaded.multiply(k) for k in scalars] == expected
+            loaded.save(tmp_path / "copy.table")
+            assert (tmp_path / "copy.table").read_bytes() == path.read_bytes()
+
+    with pytest.raises(ValueError):
+        GeneratorTable.build("secp256k1", 0)
+    with pytest.raises(ValueError):
+        GeneratorTable.build("ed25519")
+    with pytest.raises(ValueError, match="for curve 'secp256r1'"):
+        GeneratorTable.load(path, "secp256k1")
+    data = bytearray(path.read_bytes())
+    path.write_bytes(data[:-64])
+    with pytest.raises(ValueError, match="size"):
+        GeneratorTable.load(path)
+    data[-64 * 255] ^= 1
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="Invalid table"):
+        GeneratorTable.load(path)
+    path.write_bytes(b"\x00" * 100)
+    with pytest.raises(ValueError, match="Not a generator table"):
+        GeneratorTable.load(path)
+
+
+def test_backend_tables(tmp_path):
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    path = tmp_path / "secp256k1.table"
+    GeneratorTable.build("secp256k1", 4).save(path)
+    expected = slip10.get_xpub_from_path("m/0h/1/2")
+    backends = [
+        EcdsaBackend("secp256k1", window=0),
+        EcdsaBackend("secp256k1", window=2),
+        EcdsaBackend("secp256k1", table_path=path),
+    ]
+    assert backends[0].table is None
+    assert backends[2].table.window == 4
+    # No table by default, for a fast startup.
+    assert EcdsaBackend("secp256k1").table is None
+    for backend in backends:
+        set_backend("secp256k1", backend)
+        assert SECP256K1.backend is backend
+        assert (
+            SLIP10.from_seed(bytes.fromhex(SEED_1)).get_xpub_from_path("m/0h/1/2")
+            == expected
+        )
+        with pytest.raises(ecdsa.errors.MalformedPointError):
+            backend.privkey_to_pubkey(bytes(32))
+    set_backend("secp256k1", "ecdsa", window=3)
+    assert SECP256K1.backend.table.window == 3
+    with pytest.raises(ValueError):
+        set_backend("secp256k1", window=3)
+    with pytest.raises(ValueError):
+        EcdsaBackend("secp256k1", window=17)
+    with pytest.raises(FileNotFoundError):
+        EcdsaBackend("secp256k1", table_path=tmp_path / "missing")
@@ -0,0 +1,71 @@
+import pytest
+
+from slip10 import HARDENED_INDEX, SLIP10, PrivateDerivationError, SLIP10Node, tracing
+
+SEED_1 = "000102030405060708090a0b0c0d0e0f"
+
+
+def test_trace():
+    slip10 = SLIP10.from_seed(bytes.fromhex(SEED_1))
+    spans = []
+    with tracing.trace(spans.append):
+        slip10.get_xpub_from_path("m/0h/1")
+    assert [(s.kind, s.name, s.depth, s.hardened) for s in spans] == [
+        ("step", "private", 1, True),
+        ("step", "private", 2, False),
+        ("call", "get_xpub_from_path", 0, None),
+    ]
+    for span in spans:
+        assert span.curve == "secp256k1"
+        assert span.backend == slip10.curve.backend.name
+        assert span.duration >= 0
+    assert spans[0].start <= spans[1].start <= spans[0].start + spans[2].duration
+
+    # No more spans once the hook is removed.
+    slip10.get_xpub_from_path("m/0h/1")
+    assert len(spans) == 3
+
+    spans = []
+    tracing.add_hook(spans.append)
+    try:
+        xpub_slip10 = SLIP10.from_xpub(slip10.get_xpub_from_path("m/0h"))
+        assert [s.name for s in spans][-1] == "from_xpub"
+        assert spans[-1].depth == 1
+        del spans[:]
+        list(xpub_slip10.iter_children("m/1", 0, 2))
+        assert [(s.kind, s.name, s.depth) for s in spans] == [
+            ("step", "public", 2),
+            ("call", "iter_children", 1),
+            ("step", "public", 3),
+            ("step", "public", 3),
+        ]
+        del spans[:]
+        list(slip10.iter_path_template("m/{0,1}h"))
+        assert [(s.kind, s.name, s.hardened) for s in spans] == [
+            ("call", "iter_path_template", None),
+            ("step", "private", True),
+            ("step", "private", True),
+        ]
+        del spans[:]
+        SLIP10Node.from_slip10(slip10).get_child(HARDENED_INDEX)
+        assert [s.name for s in spans] == ["get_child"]
+        del spans[:]
+        with pytest.raises(PrivateDerivationError):
+            xpub_slip10.get_xpub_from_path("m/0h")
+        assert [s.name for s in spans] == ["get_xpub_from_path"]
+
+        ed25519 = SLIP10.from_seed(bytes.fromhex(SEED_1), curve_name="ed25519")
+        del spans[:]
+        ed25519.get_privkey_from_path("m/0h")
+        assert [(s.name, s.curve, s.backend) for s in spans] == [
+            ("private", "ed25519", None),
+            ("get_privkey_from_path", "ed25519", None),
+        ]
+        # The calls made by a call are part of its span.
+        del spans[:]
+        slip10.get_pubkey_from_path("m/1/2")
+        assert [s.name for s in spans] == ["public", "public", "get_pubkey_from_path"]
+        assert not tracing._local.in_call
+    finally:
+        tracing.remove_hook(spans.append)
+    assert tracing._hooks == ()